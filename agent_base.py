@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel
@@ -41,12 +43,52 @@ class CategorizedNews(BaseModel):
     trend_level: str  # 'high', 'medium', 'low'
 
 
-class AgentMessage(BaseModel):
+@dataclass(slots=True)
+class AgentMessage:
+    """에이전트 간 프로세스 내부 메시지 (검증이 필요한 경계에서는 Pydantic 모델 사용)"""
     sender: str
     receiver: str
     message_type: str
     data: Dict[str, Any]
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+class SPSCQueue:
+    """단일 소비자용 경량 메시지 큐
+
+    asyncio.Queue와 같은 인터페이스(put/put_nowait/get/get_nowait/empty/qsize)를
+    deque와 Event 하나로 구현한다. 소비자가 하나뿐인 에이전트는 대기자 목록을
+    관리할 필요가 없으므로, 한 번 깨어나면 쌓인 메시지를 바로 이어서 꺼낸다.
+    이벤트 루프 안에서만 사용하므로 생산자가 여럿이어도 안전하다.
+    """
+    
+    def __init__(self):
+        self._items = deque()
+        self._ready = asyncio.Event()
+    
+    def put_nowait(self, item: Any):
+        self._items.append(item)
+        self._ready.set()
+    
+    async def put(self, item: Any):
+        self.put_nowait(item)
+    
+    def get_nowait(self) -> Any:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        return self._items.popleft()
+    
+    async def get(self) -> Any:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+    
+    def empty(self) -> bool:
+        return not self._items
+    
+    def qsize(self) -> int:
+        return len(self._items)
 
 
 class BaseAgent(ABC):
@@ -54,17 +96,22 @@ class BaseAgent(ABC):
         self.name = name
         self.message_queue = asyncio.Queue()
         self.running = False
+        # start()가 메시지 루프에 진입하기 직전에 설정됨
+        self.ready = asyncio.Event()
         self.logger = logging.getLogger(f"agent.{name}")
     
     async def start(self):
         """에이전트 시작"""
         self.running = True
+        self.ready.set()
         self.logger.info(f"Agent {self.name} started")
         await self.run()
     
     async def stop(self):
         """에이전트 중지"""
         self.running = False
+        # 메시지를 기다리는 루프를 깨우기 위한 종료 신호
+        self.message_queue.put_nowait(None)
         self.logger.info(f"Agent {self.name} stopped")
     
     async def send_message(self, receiver: str, message_type: str, data: Dict[str, Any]):
@@ -78,13 +125,23 @@ class BaseAgent(ABC):
         # 메시지 브로커를 통해 전송 (여기서는 간단하게 큐 사용)
         await message_broker.send_message(message)
     
-    async def receive_message(self) -> Optional[AgentMessage]:
-        """메시지 수신"""
+    async def receive_message(self, timeout: Optional[float] = None) -> Optional[AgentMessage]:
+        """메시지 수신 (timeout이 없으면 메시지가 올 때까지 대기, 종료 신호·타임아웃 시 None)"""
+        if timeout is None:
+            return await self.message_queue.get()
+        
         try:
-            return await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
+            return await asyncio.wait_for(self.message_queue.get(), timeout=timeout)
         except asyncio.TimeoutError:
             return None
     
+    async def receive_batch(self, max_size: int = 16) -> List[AgentMessage]:
+        """메시지 일괄 수신 (첫 메시지까지 대기 후 쌓여 있는 메시지를 함께 반환)"""
+        batch = [await self.message_queue.get()]
+        while len(batch) < max_size and not self.message_queue.empty():
+            batch.append(self.message_queue.get_nowait())
+        return [message for message in batch if message is not None]
+    
     @abstractmethod
     async def run(self):
         """에이전트 메인 실행 로직"""
@@ -103,8 +160,14 @@ class MessageBroker:
         self.agents: Dict[str, BaseAgent] = {}
         self.logger = logging.getLogger("message_broker")
     
-    def register_agent(self, agent: BaseAgent):
-        """에이전트 등록"""
+    def register_agent(self, agent: BaseAgent, single_consumer: bool = False):
+        """에이전트 등록 (single_consumer=True면 경량 SPSC 큐 사용)"""
+        if single_consumer and not isinstance(agent.message_queue, SPSCQueue):
+            # 등록 전에 쌓인 메시지는 새 큐로 옮김
+            queue = SPSCQueue()
+            while not agent.message_queue.empty():
+                queue.put_nowait(agent.message_queue.get_nowait())
+            agent.message_queue = queue
         self.agents[agent.name] = agent
         self.logger.info(f"Agent {agent.name} registered")
     
@@ -1,12 +1,19 @@
 import asyncio
 import aiohttp
+import hashlib
 import json
 import re
+from collections import OrderedDict
 from typing import Dict, Any, List, Tuple, Union, Optional
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 from agent_base import BaseAgent, AgentMessage, NewsItem, TranslatedNews, AnalyzedNews, message_broker
+from article_scoring import ScoringTables, init_worker, score_article, score_article_in_worker
+from keyword_matcher import KeywordMatcher
+from summary_cache import SummaryCache
+from llm_clients import get_llm_session, close_llm_session
 
 
 class AnalyzerAgent(BaseAgent):
@@ -39,54 +46,128 @@ class AnalyzerAgent(BaseAgent):
             "인공지능": 0.7
         }
         
+        # (키워드, 소문자 키워드, 가중치) - 매 호출마다 lower() 하지 않도록 미리 계산
+        self._ai_keywords_lower = [
+            (keyword, keyword.lower(), weight)
+            for keyword, weight in self.ai_keywords_weights.items()
+        ]
+        # 문장 단위 핵심 포인트 추출용 AI 키워드 매칭기
+        self._ai_matcher = KeywordMatcher(self.ai_keywords_weights)
+        
+        # 중요 키워드 가중치
+        self.important_keywords_weights = {
+            "발표": 0.2, "출시": 0.2, "투자": 0.15, "인수": 0.15,
+            "launch": 0.2, "release": 0.2, "investment": 0.15, "acquisition": 0.15
+        }
+        
+        # 중요도·AI 관련성 점수 계산용 키워드 테이블 (워커 프로세스에는 가중치 dict만 전달)
+        self._scoring_tables = ScoringTables(self.ai_keywords_weights, self.important_keywords_weights)
+        
+        # 문장 분리 정규식
+        self._sentence_re = re.compile(r'[.!?]+')
+        
         # 최대 요약 라인 수
         self.max_summary_lines = 10
+        
+        # 한 번에 동시 처리할 최대 메시지 수 (일괄 메시지의 뉴스도 합쳐서 이 수만큼만 동시에 분석)
+        self.batch_size = 16
+        self._analyze_semaphore = asyncio.Semaphore(self.batch_size)
+        
+        # LLM 요약 캐시 (정확 일치 + 임베딩 유사도)
+        # (정확 일치 항목은 SQLite 파일에도 저장해 재시작 후 재사용, 빈 값이면 메모리만 사용)
+        self.summary_cache = SummaryCache(
+            maxsize=1000, ttl=86400, semantic_threshold=0.92,
+            path=os.getenv("SUMMARY_CACHE_PATH", "summary_cache.db")
+        )
+        self.embedding_model = "text-embedding-3-small"
+        
+        # 이미 분석한 기사 해시 (URL + 본문 앞부분, 최근 N개만 유지)
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._seen_max = 10000
+        
+        # 점수 계산 프로세스 풀 크기 (0이면 이벤트 루프에서 바로 계산, 대량 백필용)
+        self.score_workers = int(os.getenv("ANALYZER_SCORE_WORKERS", "0"))
+        self._score_pool: Optional[ProcessPoolExecutor] = None
     
     async def run(self):
         """에이전트 메인 실행 로직"""
         while self.running:
             try:
-                # 메시지 처리
-                message = await self.receive_message()
-                if message:
-                    await self.process_message(message)
-                
-                await asyncio.sleep(1)
+                # 쌓여 있는 메시지를 한 번에 꺼내 동시에 처리
+                messages = await self.receive_batch(self.batch_size)
+                await asyncio.gather(*(self.process_message(m) for m in messages))
                 
             except Exception as e:
                 self.logger.error(f"Error in analyzer agent: {e}")
                 await asyncio.sleep(5)
     
+    async def stop(self):
+        """에이전트 중지"""
+        await super().stop()
+        await self.close()
+    
+    async def close(self):
+        """HTTP 세션, 요약 캐시 저장소, 점수 계산 프로세스 풀 정리"""
+        await close_llm_session()
+        self.summary_cache.close()
+        if self._score_pool is not None:
+            self._score_pool.shutdown(wait=False, cancel_futures=True)
+            self._score_pool = None
+    
     async def process_message(self, message: AgentMessage):
         """수신된 메시지 처리"""
         if message.message_type == "analyze_news":
             await self.analyze_news_message(message)
+        elif message.message_type == "analyze_news_batch":
+            await self.analyze_news_batch_message(message)
         elif message.message_type == "get_analysis_stats":
             await self.send_analysis_stats(message.sender)
     
     async def analyze_news_message(self, message: AgentMessage):
         """뉴스 분석 처리"""
+        await self._handle_news_bounded(message.data["news"], message.sender)
+    
+    async def analyze_news_batch_message(self, message: AgentMessage):
+        """뉴스 일괄 분석 처리 (한 메시지로 전달된 뉴스를 batch_size개씩 동시에 분석)"""
+        await asyncio.gather(*(
+            self._handle_news_bounded(news_data, message.sender)
+            for news_data in message.data["news_items"]
+        ))
+    
+    async def _handle_news_bounded(self, news_data: Union[NewsItem, TranslatedNews, Dict[str, Any]], sender: str):
+        """동시 분석 수를 batch_size로 제한해 handle_news 실행 (LLM API 호출 폭주 방지)"""
+        async with self._analyze_semaphore:
+            await self.handle_news(news_data, sender)
+    
+    async def handle_news(self, news_data: Union[NewsItem, TranslatedNews, Dict[str, Any]], sender: str):
+        """뉴스 한 건 분석 후 분류기로 전달"""
         try:
-            news_data = message.data["news"]
-            
             # NewsItem 또는 TranslatedNews 처리
-            if "translated_title" in news_data:
+            # (프로세스 내부에서는 모델 객체가 그대로 전달되므로 dict일 때만 검증)
+            if isinstance(news_data, (NewsItem, TranslatedNews)):
+                news = news_data
+            elif "translated_title" in news_data:
                 news = TranslatedNews(**news_data)
             else:
                 news = NewsItem(**news_data)
             
+            # 중복 기사는 분석(LLM 호출 포함)을 건너뜀
+            if self._is_duplicate(news):
+                self.logger.debug(f"Dedup skip: {news.original.url if isinstance(news, TranslatedNews) else news.url}")
+                return
+            
             # 뉴스 분석 수행
             analyzed_news = await self.analyze_news(news)
             
             if analyzed_news:
                 # 분석 결과를 분류기로 전송
                 await self.send_message("categorizer", "categorize_news", {
-                    "analyzed_news": analyzed_news.dict()
+                    "analyzed_news": analyzed_news
                 })
                 
                 # 원래 발신자에게 결과 통보
-                if message.sender != "translator" and message.sender != "collector":
-                    await self.send_message(message.sender, "analysis_complete", {
+                if sender != "translator" and sender != "collector":
+                    await self.send_message(sender, "analysis_complete", {
                     "news_id": analyzed_news.news.original.id if isinstance(analyzed_news.news, TranslatedNews) else analyzed_news.news.id,
                     "importance_score": analyzed_news.importance_score
                 })
@@ -97,6 +178,23 @@ class AnalyzerAgent(BaseAgent):
         except Exception as e:
             self.logger.error(f"Error analyzing news: {e}")
     
+    def _is_duplicate(self, news: Union[NewsItem, TranslatedNews]) -> bool:
+        """이미 처리한 기사인지 확인하고 처음 보는 기사는 기록"""
+        original = news.original if isinstance(news, TranslatedNews) else news
+        digest = hashlib.blake2b(
+            (original.url + original.content[:512]).encode(),
+            digest_size=16
+        ).hexdigest()
+        
+        if digest in self._seen:
+            self._seen.move_to_end(digest)
+            return True
+        
+        self._seen[digest] = None
+        if len(self._seen) > self._seen_max:
+            self._seen.popitem(last=False)
+        return False
+    
     async def analyze_news(self, news: Union[NewsItem, TranslatedNews]) -> Optional[AnalyzedNews]:
         """뉴스 분석 수행"""
         try:
@@ -115,10 +213,10 @@ class AnalyzerAgent(BaseAgent):
             key_points = await self.extract_key_points(title, content)
             
             # 중요도 및 AI 관련성 평가
-            importance_score = self.evaluate_importance(title, content)
-            ai_relevance = self.evaluate_ai_relevance(title, content)
+            importance_score, ai_relevance = await self.score_article(title, content)
             
-            analyzed_news = AnalyzedNews(
+            # 내부에서 계산한 값이므로 검증 없이 생성
+            analyzed_news = AnalyzedNews.model_construct(
                 news=news,
                 summary=summary,
                 key_points=key_points,
@@ -132,6 +230,22 @@ class AnalyzerAgent(BaseAgent):
             self.logger.error(f"Analysis failed: {e}")
             return None
     
+    async def score_article(self, title: str, content: str) -> Tuple[float, float]:
+        """중요도와 AI 관련성 점수 계산 (프로세스 풀이 설정되어 있으면 워커에서 계산)"""
+        if self.score_workers <= 0:
+            return score_article(title, content, self._scoring_tables)
+        
+        if self._score_pool is None:
+            # 워커는 에이전트 모듈을 import하지 않고 전달받은 가중치로 테이블을 구성
+            self._score_pool = ProcessPoolExecutor(
+                max_workers=self.score_workers,
+                initializer=init_worker,
+                initargs=(self.ai_keywords_weights, self.important_keywords_weights)
+            )
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._score_pool, score_article_in_worker, title, content)
+    
     async def generate_summary(self, title: str, content: str) -> str:
         """뉴스 요약 생성 (10줄 이내)"""
         if self.analysis_model == "openai" and self.openai_api_key:
@@ -141,6 +255,19 @@ class AnalyzerAgent(BaseAgent):
     
     async def generate_summary_with_gpt(self, title: str, content: str) -> str:
         """GPT를 사용한 요약 생성"""
+        cache_key = SummaryCache.make_key(title, content, self.analysis_model)
+        cached_summary = await self.summary_cache.get(cache_key)
+        if cached_summary is not None:
+            return cached_summary
+        
+        # 거의 같은 기사가 이미 요약되었는지 임베딩으로 확인
+        embedding = await self.get_embedding(f"{title}\n{content[:2000]}")
+        if embedding:
+            similar_summary = self.summary_cache.get_similar(embedding)
+            if similar_summary is not None:
+                await self.summary_cache.set(cache_key, similar_summary)
+                return similar_summary
+        
         try:
             url = "https://api.openai.com/v1/chat/completions"
             
@@ -167,24 +294,57 @@ class AnalyzerAgent(BaseAgent):
                 "temperature": 0.3
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        summary = result["choices"][0]["message"]["content"].strip()
-                        return self.limit_lines(summary, self.max_summary_lines)
-                    else:
-                        self.logger.error(f"OpenAI API error: {response.status}")
-                        return self.generate_simple_summary(title, content)
-                        
+            session = await get_llm_session()
+            async with session.post(url, headers=headers, json=data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    summary = result["choices"][0]["message"]["content"].strip()
+                    summary = self.limit_lines(summary, self.max_summary_lines)
+                    
+                    await self.summary_cache.set(cache_key, summary)
+                    if embedding:
+                        self.summary_cache.add_embedding(embedding, summary)
+                    return summary
+                else:
+                    self.logger.error(f"OpenAI API error: {response.status}")
+                    return self.generate_simple_summary(title, content)
+                    
         except Exception as e:
             self.logger.error(f"GPT summary error: {e}")
             return self.generate_simple_summary(title, content)
     
+    async def get_embedding(self, text: str) -> Optional[List[float]]:
+        """유사도 캐시 조회용 임베딩 생성"""
+        try:
+            url = "https://api.openai.com/v1/embeddings"
+            
+            headers = {
+                "Authorization": f"Bearer {self.openai_api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            data = {
+                "model": self.embedding_model,
+                "input": text
+            }
+            
+            session = await get_llm_session()
+            async with session.post(url, headers=headers, json=data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return result["data"][0]["embedding"]
+                else:
+                    self.logger.error(f"OpenAI embedding API error: {response.status}")
+                    return None
+                        
+        except Exception as e:
+            self.logger.error(f"Embedding error: {e}")
+            return None
+    
     def generate_simple_summary(self, title: str, content: str) -> str:
         """간단한 요약 생성"""
         # 내용에서 문장 분리
-        sentences = re.split(r'[.!?]+', content)
+        sentences = self._sentence_re.split(content)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         # 제목 포함
@@ -202,62 +362,29 @@ class AnalyzerAgent(BaseAgent):
         key_points = []
         
         # AI 관련 키워드 포함 문장 찾기
-        sentences = re.split(r'[.!?]+', content)
+        sentences = self._sentence_re.split(content)
         
         for sentence in sentences:
+            # 최대 5개 키 포인트를 채우면 나머지 문장은 확인하지 않음
+            if len(key_points) >= 5:
+                break
+            
             sentence = sentence.strip()
             if len(sentence) < 10:
                 continue
-                
-            # AI 키워드 확인
-            for keyword in self.ai_keywords_weights.keys():
-                if keyword.lower() in sentence.lower():
+            
+            # 문장을 한 번만 훑어 포함된 AI 키워드 확인
+            sentence_keywords = self._ai_matcher.counts(sentence.lower())
+            if not sentence_keywords:
+                continue
+            
+            # 키워드 우선순위(정의 순서)대로 첫 번째 키워드 선택
+            for keyword, keyword_lower, _ in self._ai_keywords_lower:
+                if keyword_lower in sentence_keywords:
                     key_points.append(f"{keyword}: {sentence}")
                     break
         
-        # 최대 5개 키 포인트
-        return key_points[:5]
-    
-    def evaluate_importance(self, title: str, content: str) -> float:
-        """뉴스 중요도 평가 (0.0 - 1.0)"""
-        importance_score = 0.3  # 기본 점수
-        
-        text = (title + " " + content).lower()
-        
-        # 중요 키워드 가중치
-        important_keywords = {
-            "발표": 0.2, "출시": 0.2, "투자": 0.15, "인수": 0.15,
-            "launch": 0.2, "release": 0.2, "investment": 0.15, "acquisition": 0.15
-        }
-        
-        for keyword, weight in important_keywords.items():
-            if keyword in text:
-                importance_score += weight
-        
-        # 문서 길이 기반 중요도
-        if len(content) > 1000:
-            importance_score += 0.1
-        elif len(content) > 2000:
-            importance_score += 0.2
-        
-        return min(importance_score, 1.0)
-    
-    def evaluate_ai_relevance(self, title: str, content: str) -> float:
-        """AI 관련성 평가 (0.0 - 1.0)"""
-        text = (title + " " + content).lower()
-        relevance_score = 0.0
-        
-        for keyword, weight in self.ai_keywords_weights.items():
-            if keyword.lower() in text:
-                relevance_score += weight
-        
-        # 여러 키워드가 있을 경우 보너스
-        keyword_count = sum(1 for keyword in self.ai_keywords_weights.keys() 
-                          if keyword.lower() in text)
-        if keyword_count > 1:
-            relevance_score *= 1.2
-        
-        return min(relevance_score, 1.0)
+        return key_points
     
     def limit_lines(self, text: str, max_lines: int) -> str:
         """라인 수 제한"""
@@ -270,7 +397,9 @@ class AnalyzerAgent(BaseAgent):
             "model": self.analysis_model,
             "max_summary_lines": self.max_summary_lines,
             "openai_configured": bool(self.openai_api_key),
-            "ai_keywords_count": len(self.ai_keywords_weights)
+            "ai_keywords_count": len(self.ai_keywords_weights),
+            "summary_cache_size": len(self.summary_cache),
+            "summary_cache_hits": self.summary_cache.hits + self.summary_cache.semantic_hits
         }
         
         await self.send_message(requester, "analysis_stats", stats)
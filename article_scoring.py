@@ -0,0 +1,99 @@
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+
+
+class ScoringTables:
+    """기사 점수 계산용 키워드 테이블
+
+    에이전트 모듈에 의존하지 않으므로 프로세스 풀 워커에서도 에이전트를 만들지 않고
+    가중치 dict만으로 다시 구성할 수 있다.
+    """
+
+    def __init__(self, ai_keywords_weights: Mapping[str, float],
+                 important_keywords_weights: Mapping[str, float]):
+        self.ai_keywords_weights = dict(ai_keywords_weights)
+        self.important_keywords_weights = dict(important_keywords_weights)
+
+        # 매칭기는 소문자 키워드를 돌려주므로 가중치도 소문자 키로 보관
+        self.ai_keyword_weights_lower = {
+            keyword.lower(): weight for keyword, weight in self.ai_keywords_weights.items()
+        }
+
+        # AI 키워드와 중요 키워드를 한 번에 찾는 매칭기
+        self.matcher = KeywordMatcher(
+            list(self.ai_keywords_weights) + list(self.important_keywords_weights)
+        )
+
+
+def featurize(title: str, content: str, matcher: KeywordMatcher) -> Dict[str, Any]:
+    """기사별 공통 특징 추출 (평가 함수들이 함께 사용)"""
+    text = (title + " " + content).lower()
+    return {
+        "lower": text,
+        "length": len(content),
+        "keyword_counts": matcher.counts(text)
+    }
+
+
+def evaluate_importance(features: Dict[str, Any], important_keywords_weights: Mapping[str, float]) -> float:
+    """뉴스 중요도 평가 (0.0 - 1.0)"""
+    importance_score = 0.3  # 기본 점수
+
+    keyword_counts = features["keyword_counts"]
+
+    # 중요 키워드 가중치
+    for keyword, weight in important_keywords_weights.items():
+        if keyword in keyword_counts:
+            importance_score += weight
+
+    # 문서 길이 기반 중요도
+    if features["length"] > 1000:
+        importance_score += 0.1
+    elif features["length"] > 2000:
+        importance_score += 0.2
+
+    return min(importance_score, 1.0)
+
+
+def evaluate_ai_relevance(features: Dict[str, Any], ai_keyword_weights_lower: Mapping[str, float]) -> float:
+    """AI 관련성 평가 (0.0 - 1.0)"""
+    keyword_counts = features["keyword_counts"]
+    relevance_score = 0.0
+    keyword_count = 0
+
+    for keyword_lower, weight in ai_keyword_weights_lower.items():
+        if keyword_lower in keyword_counts:
+            relevance_score += weight
+            keyword_count += 1
+
+    # 여러 키워드가 있을 경우 보너스
+    if keyword_count > 1:
+        relevance_score *= 1.2
+
+    return min(relevance_score, 1.0)
+
+
+def score_article(title: str, content: str, tables: ScoringTables) -> Tuple[float, float]:
+    """기사 점수 계산 (중요도, AI 관련성)"""
+    # 소문자 텍스트와 키워드 빈도는 한 번만 계산
+    features = featurize(title, content, tables.matcher)
+    return (
+        evaluate_importance(features, tables.important_keywords_weights),
+        evaluate_ai_relevance(features, tables.ai_keyword_weights_lower)
+    )
+
+
+# 프로세스 풀 워커마다 한 번 구성되는 테이블 (init_worker에서 설정)
+_worker_tables: Optional[ScoringTables] = None
+
+
+def init_worker(ai_keywords_weights: Mapping[str, float], important_keywords_weights: Mapping[str, float]):
+    """프로세스 풀 initializer: 전달받은 가중치로 워커의 키워드 테이블 구성"""
+    global _worker_tables
+    _worker_tables = ScoringTables(ai_keywords_weights, important_keywords_weights)
+
+
+def score_article_in_worker(title: str, content: str) -> Tuple[float, float]:
+    """프로세스 풀 워커에서 기사 점수 계산"""
+    return score_article(title, content, _worker_tables)
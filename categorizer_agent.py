@@ -4,6 +4,7 @@ from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 from agent_base import BaseAgent, AgentMessage, AnalyzedNews, CategorizedNews, TranslatedNews, NewsItem, message_broker
+from keyword_matcher import KeywordMatcher
 
 
 class CategorizerAgent(BaseAgent):
@@ -66,23 +67,56 @@ class CategorizerAgent(BaseAgent):
             }
         }
         
+        # 기술 관련 추가 태그
+        self.tech_tags = ["AI", "인공지능", "innovation", "혁신"]
+        self._tech_tags_lower = [(tag, tag.lower()) for tag in self.tech_tags]
+        
+        # 주요 카테고리 -> 태그 후보 [(키워드, 소문자 키워드)] (주요 카테고리를 제외한 모든 카테고리 키워드)
+        self._tag_candidates: Dict[str, List[Tuple[str, str]]] = {
+            primary_category: [
+                (keyword, keyword.lower())
+                for category_id, category_info in self.categories.items()
+                if category_id != primary_category
+                for keyword in category_info["keywords"]
+            ]
+            for primary_category in self.categories
+        }
+        
+        # 소문자 키워드 -> [(카테고리 ID, 키워드 길이 가중치, 카테고리 가중치)]
+        # 키워드 길이에 따른 가중치 (긴 키워드가 더 중요)
+        self._category_keyword_table: Dict[str, List[Tuple[str, float, float]]] = {}
+        for category_id, category_info in self.categories.items():
+            for keyword in category_info["keywords"]:
+                keyword_weight = len(keyword.split()) * 0.5 + 0.5
+                self._category_keyword_table.setdefault(keyword.lower(), []).append(
+                    (category_id, keyword_weight, category_info["weight"])
+                )
+        
+        # 카테고리 키워드와 기술 태그를 한 번에 찾는 매칭기
+        self._keyword_matcher = KeywordMatcher(
+            list(self._category_keyword_table) + [tag_lower for _, tag_lower in self._tech_tags_lower]
+        )
+        
+        # 키워드별 점수에 반영할 최대 출현 횟수 (긴 기사에서 흔한 단어가 점수를 독점하지 않도록)
+        self.keyword_count_cap = 5
+        
         # 트렌드 레벨 임계값
         self.trend_thresholds = {
             "high": 0.8,
             "medium": 0.5,
             "low": 0.0
         }
+        
+        # 한 번에 동시 처리할 최대 메시지 수
+        self.batch_size = 16
     
     async def run(self):
         """에이전트 메인 실행 로직"""
         while self.running:
             try:
-                # 메시지 처리
-                message = await self.receive_message()
-                if message:
-                    await self.process_message(message)
-                
-                await asyncio.sleep(1)
+                # 쌓여 있는 메시지를 한 번에 꺼내 동시에 처리
+                messages = await self.receive_batch(self.batch_size)
+                await asyncio.gather(*(self.process_message(m) for m in messages))
                 
             except Exception as e:
                 self.logger.error(f"Error in categorizer agent: {e}")
@@ -100,8 +134,8 @@ class CategorizerAgent(BaseAgent):
     async def categorize_news_message(self, message: AgentMessage):
         """뉴스 분류 처리"""
         try:
-            analyzed_news_data = message.data["analyzed_news"]
-            analyzed_news = AnalyzedNews(**analyzed_news_data)
+            # 모델 객체는 재검증 없이 그대로, dict는 검증 후 변환
+            analyzed_news = AnalyzedNews.model_validate(message.data["analyzed_news"])
             
             # 뉴스 분류 수행
             categorized_news = await self.categorize_news(analyzed_news)
@@ -141,8 +175,11 @@ class CategorizerAgent(BaseAgent):
             # 전체 텍스트
             full_text = f"{title} {content} {summary} {key_points}".lower()
             
+            # 키워드 빈도는 한 번만 계산해 점수와 태그 생성에 함께 사용
+            keyword_counts = self._keyword_matcher.counts(full_text, cap=self.keyword_count_cap)
+            
             # 카테고리별 점수 계산
-            category_scores = self.calculate_category_scores(full_text)
+            category_scores = self.calculate_category_scores(keyword_counts)
             
             # 최고 점수 카테고리 선택
             best_category = max(category_scores.items(), key=lambda x: x[1])
@@ -153,12 +190,13 @@ class CategorizerAgent(BaseAgent):
             category_name = self.categories[category_id]["name"]
             
             # 태그 생성
-            tags = self.generate_tags(full_text, category_id)
+            tags = self.generate_tags(keyword_counts, category_id)
             
             # 트렌드 레벨 결정
             trend_level = self.determine_trend_level(analyzed_news, category_score)
             
-            categorized_news = CategorizedNews(
+            # 내부에서 계산한 값이므로 검증 없이 생성
+            categorized_news = CategorizedNews.model_construct(
                 analyzed_news=analyzed_news,
                 category=category_name,
                 tags=tags,
@@ -171,48 +209,31 @@ class CategorizerAgent(BaseAgent):
             self.logger.error(f"Categorization failed: {e}")
             return None
     
-    def calculate_category_scores(self, text: str) -> Dict[str, float]:
+    def calculate_category_scores(self, keyword_counts: Dict[str, int]) -> Dict[str, float]:
         """카테고리별 점수 계산"""
-        scores = {}
+        scores = {category_id: 0.0 for category_id in self.categories}
         
-        for category_id, category_info in self.categories.items():
-            score = 0.0
-            keywords = category_info["keywords"]
-            weight = category_info["weight"]
-            
-            for keyword in keywords:
-                # 키워드 빈도수 계산
-                count = text.count(keyword.lower())
-                if count > 0:
-                    # 키워드 길이에 따른 가중치 (긴 키워드가 더 중요)
-                    keyword_weight = len(keyword.split()) * 0.5 + 0.5
-                    score += count * keyword_weight * weight
-            
-            scores[category_id] = score
+        # 키워드 빈도수 기반 점수
+        for keyword_lower, count in keyword_counts.items():
+            for category_id, keyword_weight, weight in self._category_keyword_table.get(keyword_lower, ()):
+                scores[category_id] += count * keyword_weight * weight
         
         return scores
     
-    def generate_tags(self, text: str, primary_category: str) -> List[str]:
+    def generate_tags(self, keyword_counts: Dict[str, int], primary_category: str) -> List[str]:
         """태그 생성"""
         tags = []
         
-        # 모든 카테고리 키워드 검색
-        all_keywords = []
-        for category_id, category_info in self.categories.items():
-            if category_id != primary_category:
-                all_keywords.extend(category_info["keywords"])
-        
-        # 텍스트에서 키워드 찾기
-        for keyword in all_keywords:
-            if keyword.lower() in text.lower() and keyword not in tags:
+        # 텍스트에서 키워드 찾기 (주요 카테고리를 제외한 모든 카테고리 키워드)
+        for keyword, keyword_lower in self._tag_candidates[primary_category]:
+            if keyword_lower in keyword_counts and keyword not in tags:
                 tags.append(keyword)
                 if len(tags) >= 5:  # 최대 5개 태그
                     break
         
         # 기술 관련 추가 태그
-        tech_tags = ["AI", "인공지능", "innovation", "혁신"]
-        for tag in tech_tags:
-            if tag.lower() in text.lower() and tag not in tags:
+        for tag, tag_lower in self._tech_tags_lower:
+            if tag_lower in keyword_counts and tag not in tags:
                 tags.append(tag)
                 if len(tags) >= 8:  # 최대 8개 태그
                     break
@@ -239,12 +260,12 @@ class CategorizerAgent(BaseAgent):
         """발신 에이전트들에게 분류된 뉴스 전송"""
         # 텔레그램 발신자에게 전송
         await self.send_message("telegram-sender", "send_news", {
-            "categorized_news": categorized_news.dict()
+            "categorized_news": categorized_news
         })
         
         # 메일 발신자에게 전송
         await self.send_message("mail-sender", "send_news", {
-            "categorized_news": categorized_news.dict()
+            "categorized_news": categorized_news
         })
     
     async def send_categories_info(self, requester: str):
@@ -273,4 +294,4 @@ class CategorizerAgent(BaseAgent):
 
 # CategorizerAgent 인스턴스 생성 및 등록
 categorizer_agent = CategorizerAgent()
-message_broker.register_agent(categorizer_agent)
\ No newline at end of file
+message_broker.register_agent(categorizer_agent, single_consumer=True)
\ No newline at end of file
@@ -1,13 +1,22 @@
 import asyncio
 import aiohttp
 import feedparser
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+from dateutil.parser import parse as parse_datetime
+import contextlib
 import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from collections import OrderedDict
 from urllib.parse import urljoin
 import logging
 
 from agent_base import BaseAgent, AgentMessage, NewsItem, message_broker
+from keyword_matcher import KeywordMatcher
 
 
 class CollectorAgent(BaseAgent):
@@ -41,30 +50,139 @@ class CollectorAgent(BaseAgent):
             "computer vision", "natural language processing", "NLP",
             "예지능", "머신러닝", "딥러닝", "신경망", "GPT", "챗GPT"
         ]
+        self._ai_matcher = KeywordMatcher(self.ai_keywords)
         
-        self.last_collection_time = datetime.now() - timedelta(hours=1)
+        # 마지막 수집 시작 시각 (monotonic, 시계 변경에 영향받지 않음)
+        self._last_collect_mono = 0.0
         self.collection_interval = 300  # 5분
+        
+        # 수집용 HTTP 세션 (주기 수집 간 keep-alive 연결과 DNS 캐시 재사용, 최초 사용 시 생성)
+        self._session: Optional[aiohttp.ClientSession] = None
+        # 동시에 요청할 최대 소스 수
+        self._fetch_semaphore = asyncio.BoundedSemaphore(10)
+        
+        # 일시적 오류 재시도 설정 (429·5xx 응답과 네트워크 오류)
+        self.max_fetch_tries = 4
+        self.retry_statuses = {429, 500, 502, 503, 504}
+        
+        # 이미 수집한 뉴스 ID (수집 주기를 넘어 중복 제거, 최근 N개만 유지)
+        self._seen_ids: "OrderedDict[str, None]" = OrderedDict()
+        self._seen_max = 10000
+        
+        # RSS 조건부 요청용 캐시 검증자 (URL -> (ETag, Last-Modified))
+        # 재시작 후에도 첫 수집부터 조건부 요청을 보내도록 파일에 저장
+        self._feed_meta: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self.feed_meta_file = "feed_meta.json"
+        self._feed_meta_dirty = False
+        self.load_feed_meta()
+        
+        # 주기적 수집 태스크 (run에서 시작)
+        self._collect_task: Optional[asyncio.Task] = None
+        # 수집 주기 직렬화 (같은 피드를 두 번 받거나 _feed_meta를 동시에 갱신하지 않도록)
+        self._collect_lock = asyncio.Lock()
     
     async def run(self):
         """에이전트 메인 실행 로직"""
+        # 주기적 수집은 별도 태스크로 돌리고, 메인 루프는 메시지가 올 때까지 대기
+        self._collect_task = asyncio.create_task(self._periodic_collect())
+        try:
+            while self.running:
+                try:
+                    message = await self.receive_message()
+                    if message:
+                        await self.process_message(message)
+                    
+                except Exception as e:
+                    self.logger.error(f"Error in collector agent: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            await self._cancel_periodic_collect()
+    
+    async def _periodic_collect(self):
+        """수집 간격마다 뉴스 수집"""
         while self.running:
+            self._last_collect_mono = time.monotonic()
             try:
-                # 메시지 처리
-                message = await self.receive_message()
-                if message:
-                    await self.process_message(message)
-                
-                # 주기적 뉴스 수집
-                current_time = datetime.now()
-                if (current_time - self.last_collection_time).seconds >= self.collection_interval:
-                    await self.collect_and_distribute_news()
-                    self.last_collection_time = current_time
-                
-                await asyncio.sleep(1)
-                
+                await self.collect_and_distribute_news()
             except Exception as e:
-                self.logger.error(f"Error in collector agent: {e}")
-                await asyncio.sleep(5)
+                self.logger.error(f"Error in periodic collection: {e}")
+            
+            # 수집 시작 시각 기준으로 다음 수집까지 대기 (수집 소요 시간만큼 주기가 밀리지 않음)
+            delay = self._last_collect_mono + self.collection_interval - time.monotonic()
+            await asyncio.sleep(max(delay, 0))
+    
+    async def _cancel_periodic_collect(self):
+        """주기적 수집 태스크를 취소하고 끝날 때까지 대기"""
+        task, self._collect_task = self._collect_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    
+    async def stop(self):
+        """에이전트 중지 (진행 중인 수집을 먼저 멈춘 뒤 세션 정리)"""
+        await super().stop()
+        await self._cancel_periodic_collect()
+        await self.close()
+    
+    def load_feed_meta(self):
+        """RSS 캐시 검증자 로드"""
+        try:
+            if os.path.exists(self.feed_meta_file):
+                with open(self.feed_meta_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._feed_meta = {url: (meta[0], meta[1]) for url, meta in data.items()}
+                self.logger.info(f"Loaded cache validators for {len(self._feed_meta)} feeds")
+        except Exception as e:
+            self.logger.error(f"Error loading feed metadata: {e}")
+    
+    async def save_feed_meta(self):
+        """변경된 RSS 캐시 검증자 저장 (파일 쓰기는 스레드에서 실행)"""
+        if not self._feed_meta_dirty:
+            return
+        # 쓰는 동안 생긴 변경은 다음 저장에 반영되도록 먼저 내리고, 실패하면 다시 세움
+        self._feed_meta_dirty = False
+        try:
+            payload = json.dumps(self._feed_meta, ensure_ascii=False).encode()
+            await asyncio.to_thread(self._write_feed_meta, payload)
+        except Exception as e:
+            self._feed_meta_dirty = True
+            self.logger.error(f"Error saving feed metadata: {e}")
+    
+    def _write_feed_meta(self, payload: bytes):
+        # 임시 파일에 쓴 뒤 교체해 저장 중 중단되어도 기존 파일이 깨지지 않도록 함
+        directory = os.path.dirname(os.path.abspath(self.feed_meta_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.feed_meta_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    async def close(self):
+        """RSS 캐시 검증자 저장 후 HTTP 세션 정리"""
+        await self.save_feed_meta()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """수집용 HTTP 세션 반환"""
+        if self._session is None or self._session.closed:
+            # 고정된 10여 개 호스트를 반복 방문하므로 호스트당 연결 수를 제한하고 DNS 결과를 오래 캐시
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=4,
+                ttl_dns_cache=600,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=15, sock_connect=5, sock_read=10)
+            )
+        return self._session
     
     async def process_message(self, message: AgentMessage):
         """수신된 메시지 처리"""
@@ -78,89 +196,146 @@ class CollectorAgent(BaseAgent):
             await self.send_message(message.sender, "sources_response", {"sources": sources})
     
     async def collect_and_distribute_news(self):
+        """뉴스 수집 및 분배 (주기 수집과 collect_now 요청이 겹치지 않도록 한 번에 한 주기씩)"""
+        async with self._collect_lock:
+            await self._collect_and_distribute_news()
+    
+    async def _collect_and_distribute_news(self):
         """뉴스 수집 및 분배"""
         self.logger.info("Starting news collection")
         
-        # 국내 뉴스 우선 수집
-        domestic_news = await self.collect_domestic_news()
-        international_news = await self.collect_international_news()
+        # 국내·해외 소스를 동시에 수집 (결과는 국내 뉴스 우선)
+        domestic_news, international_news = await asyncio.gather(
+            self.collect_domestic_news(),
+            self.collect_international_news()
+        )
         
         all_news = domestic_news + international_news
         
+        await self.save_feed_meta()
+        
         if all_news:
-            # 중복 제거
-            unique_news = self.remove_duplicates(all_news)
+            # 수집된 뉴스를 다른 에이전트에게 전송 (중복은 수집 단계에서 이미 제외됨)
+            ai_news = [news for news in all_news if self.is_ai_related(news)]
+            await self.send_news_batch_to_pipeline(ai_news)
             
-            # 수집된 뉴스를 다른 에이전트에게 전송
-            for news in unique_news:
-                if self.is_ai_related(news):
-                    await self.send_news_to_pipeline(news)
-            
-            self.logger.info(f"Collected {len(unique_news)} AI-related news items")
+            self.logger.info(f"Collected {len(ai_news)} AI-related news items")
     
     async def collect_domestic_news(self) -> List[NewsItem]:
         """국내 뉴스 수집"""
-        news_items = []
-        
-        async with aiohttp.ClientSession() as session:
-            for source_url in self.domestic_sources:
-                try:
-                    # RSS 피드인 경우
-                    if source_url.endswith('.xml') or 'feed' in source_url:
-                        news = await self.collect_from_rss(session, source_url, "ko", "kr")
-                    else:
-                        # 웹 크롤링인 경우
-                        news = await self.collect_from_web(session, source_url, "ko", "kr")
-                    
-                    news_items.extend(news)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error collecting from {source_url}: {e}")
-        
-        return news_items
+        return await self._collect(self.domestic_sources, "ko", "kr")
     
     async def collect_international_news(self) -> List[NewsItem]:
         """해외 뉴스 수집"""
-        news_items = []
+        return await self._collect(self.international_sources, "en", "us")
+    
+    async def _collect(self, sources: List[str], language: str, country: str) -> List[NewsItem]:
+        """소스 목록을 동시에 수집 (동시 요청 수는 세마포어로 제한, 결과는 소스 순서 유지)"""
+        session = await self._ensure_session()
+        results = await asyncio.gather(
+            *(self._fetch_one(session, source_url, language, country) for source_url in sources),
+            return_exceptions=True
+        )
         
-        async with aiohttp.ClientSession() as session:
-            for source_url in self.international_sources:
-                try:
-                    if source_url.endswith('.xml') or 'feed' in source_url:
-                        news = await self.collect_from_rss(session, source_url, "en", "us")
-                    else:
-                        news = await self.collect_from_web(session, source_url, "en", "us")
-                    
-                    news_items.extend(news)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error collecting from {source_url}: {e}")
+        news_items = []
+        for source_url, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Error collecting from {source_url}: {result}")
+            else:
+                news_items.extend(result)
         
         return news_items
     
+    async def _fetch_one(self, session: aiohttp.ClientSession, source_url: str,
+                         language: str, country: str) -> List[NewsItem]:
+        """단일 소스 수집"""
+        async with self._fetch_semaphore:
+            # RSS 피드인 경우
+            if source_url.endswith('.xml') or 'feed' in source_url:
+                return await self.collect_from_rss(session, source_url, language, country)
+            # 웹 크롤링인 경우
+            return await self.collect_from_web(session, source_url, language, country)
+    
+    @contextlib.asynccontextmanager
+    async def _get_with_retry(self, session: aiohttp.ClientSession, url: str,
+                              headers: Optional[Dict[str, str]] = None):
+        """GET 요청 (429·5xx 응답과 네트워크 오류는 지수 백오프로 재시도, 마지막 응답을 반환)"""
+        for attempt in range(1, self.max_fetch_tries + 1):
+            try:
+                response = await session.get(url, headers=headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_fetch_tries:
+                    raise
+                delay = self._retry_delay(attempt, None)
+                self.logger.warning(f"Request to {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.status not in self.retry_statuses or attempt == self.max_fetch_tries:
+                    break
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                response.release()
+                self.logger.warning(f"{url} returned {response.status}, retrying in {delay:.1f}s")
+            
+            await asyncio.sleep(delay)
+        
+        async with response:
+            yield response
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 지터를 더한 지수 백오프, 최대 30초)"""
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), 30.0)
+            except ValueError:
+                pass
+        return min(2 ** (attempt - 1), 30) + random.random()
+    
     async def collect_from_rss(self, session: aiohttp.ClientSession, rss_url: str, 
                               language: str, country: str) -> List[NewsItem]:
         """RSS 피드에서 뉴스 수집"""
         news_items = []
         
+        # 이전 응답의 검증자를 보내 변경이 없으면 304로 본문 없이 응답받음
+        headers = {}
+        etag, last_modified = self._feed_meta.get(rss_url, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
         try:
-            async with session.get(rss_url) as response:
+            async with self._get_with_retry(session, rss_url, headers=headers) as response:
+                if response.status == 304:
+                    self.logger.debug(f"RSS not modified: {rss_url}")
+                    return news_items
+                
                 if response.status == 200:
-                    rss_content = await response.text()
-                    feed = feedparser.parse(rss_content)
+                    # 본문은 바이트 그대로 넘겨 feedparser가 XML 선언으로 인코딩을 판단하게 함
+                    rss_bytes = await response.read()
+                    # feedparser는 순수 파이썬 파서라 큰 피드에서 이벤트 루프를 막으므로 스레드에서 파싱
+                    feed = await asyncio.to_thread(feedparser.parse, rss_bytes)
                     
                     for entry in feed.entries[:10]:  # 최신 10개만
+                        news_id = self.generate_id(entry.link)
+                        if not self.mark_seen(news_id):
+                            continue
+                        
                         news_item = NewsItem(
-                            id=self.generate_id(entry.link),
+                            id=news_id,
                             title=entry.title,
                             content=entry.description or entry.summary or "",
                             url=entry.link,
                             source=feed.feed.title,
-                            published_at=self.parse_date(entry.published),
+                            published_at=self.entry_published_at(entry),
                             language=language,
                             country=country
                         )
                         news_items.append(news_item)
+                    
+                    # 본문을 끝까지 받아 처리한 뒤에만 검증자를 갱신 (실패 시 다음 수집에서 다시 받음)
+                    validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                    if self._feed_meta.get(rss_url) != validators:
+                        self._feed_meta[rss_url] = validators
+                        self._feed_meta_dirty = True
                         
         except Exception as e:
             self.logger.error(f"Error parsing RSS {rss_url}: {e}")
@@ -173,15 +348,19 @@ class CollectorAgent(BaseAgent):
         news_items = []
         
         try:
-            async with session.get(url) as response:
+            async with self._get_with_retry(session, url) as response:
                 if response.status == 200:
                     # 실제 구현에서는 BeautifulSoup 등으로 파싱 필요
                     # 여기서는 기본 구조만 생성
                     html_content = await response.text()
                     
                     # 간단한 뉴스 아이템 생성 (실제로는 HTML 파싱 필요)
+                    news_id = self.generate_id(url)
+                    if not self.mark_seen(news_id):
+                        return news_items
+                    
                     news_item = NewsItem(
-                        id=self.generate_id(url),
+                        id=news_id,
                         title=f"News from {url}",
                         content=f"Content from {url}",
                         url=url,
@@ -199,43 +378,55 @@ class CollectorAgent(BaseAgent):
     
     def is_ai_related(self, news: NewsItem) -> bool:
         """AI 관련 뉴스인지 확인"""
-        text = (news.title + " " + news.content).lower()
-        return any(keyword.lower() in text for keyword in self.ai_keywords)
-    
-    def remove_duplicates(self, news_items: List[NewsItem]) -> List[NewsItem]:
-        """중복 뉴스 제거"""
-        seen_urls = set()
-        unique_news = []
-        
-        for news in news_items:
-            if news.url not in seen_urls:
-                seen_urls.add(news.url)
-                unique_news.append(news)
-        
-        return unique_news
-    
-    async def send_news_to_pipeline(self, news: NewsItem):
-        """수집된 뉴스를 파이프라인으로 전송"""
-        if news.language == "en":
-            # 해외 뉴스는 번역기로
-            await self.send_message("translator", "translate_news", {
-                "news": news.dict()
+        # 키워드는 매칭기 생성 시 한 번만 소문자로 변환됨
+        # 대부분 제목에서 판별되므로 제목을 먼저 확인하고, 없을 때만 본문까지 확인
+        title = news.title.lower()
+        if self._ai_matcher.contains_any(title):
+            return True
+        return self._ai_matcher.contains_any(title + " " + news.content.lower())
+    
+    def mark_seen(self, news_id: str) -> bool:
+        """처음 보는 뉴스 ID면 기록하고 True, 이미 수집한 ID면 False"""
+        if news_id in self._seen_ids:
+            self._seen_ids.move_to_end(news_id)
+            return False
+        
+        self._seen_ids[news_id] = None
+        if len(self._seen_ids) > self._seen_max:
+            self._seen_ids.popitem(last=False)
+        return True
+    
+    async def send_news_batch_to_pipeline(self, news_items: List[NewsItem]):
+        """수집된 뉴스를 대상별로 묶어 한 번씩 전송"""
+        # 해외 뉴스는 번역기로, 국내 뉴스는 바로 분석기로
+        to_translate = [news for news in news_items if news.language == "en"]
+        to_analyze = [news for news in news_items if news.language != "en"]
+        
+        if to_translate:
+            await self.send_message("translator", "translate_news_batch", {
+                "news_items": to_translate
             })
-        else:
-            # 국내 뉴스는 바로 분석기로
-            await self.send_message("analyzer", "analyze_news", {
-                "news": news.dict()
+        if to_analyze:
+            await self.send_message("analyzer", "analyze_news_batch", {
+                "news_items": to_analyze
             })
     
     def generate_id(self, url: str) -> str:
         """고유 ID 생성"""
-        return hashlib.md5(url.encode()).hexdigest()[:12]
+        # 12자리 16진수 ID를 잘라내지 않고 바로 생성
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=6).hexdigest()
+    
+    def entry_published_at(self, entry) -> datetime:
+        """RSS 항목 발행 시각 (feedparser가 파싱해 둔 UTC struct_time 우선 사용)"""
+        published_parsed = entry.get("published_parsed")
+        if published_parsed:
+            return datetime(*published_parsed[:6], tzinfo=timezone.utc)
+        return self.parse_date(entry.get("published", ""))
     
     def parse_date(self, date_str: str) -> datetime:
         """날짜 파싱"""
         try:
-            from dateutil.parser import parse
-            return parse(date_str)
+            return parse_datetime(date_str)
         except:
             return datetime.now()
 
@@ -0,0 +1,75 @@
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """다중 키워드 매칭기
+
+    pyahocorasick이 설치되어 있으면 Aho–Corasick 자동자로 텍스트를 한 번만 훑어
+    모든 키워드를 찾고, 없으면 키워드별 부분 문자열 탐색으로 동작한다.
+    입력 텍스트는 호출하는 쪽에서 소문자로 변환해 넘긴다.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        # 소문자 키워드 (중복 제거, 입력 순서 유지)
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    def counts(self, text: str, cap: Optional[int] = None) -> Dict[str, int]:
+        """텍스트에 등장한 키워드별 출현 횟수 (등장하지 않은 키워드는 제외)
+
+        cap을 주면 키워드별 횟수를 cap에서 멈춘다.
+        """
+        if self._automaton is not None:
+            counts = Counter(keyword for _, keyword in self._automaton.iter(text))
+            if cap is not None:
+                for keyword, count in counts.items():
+                    if count > cap:
+                        counts[keyword] = cap
+            return counts
+
+        counts = {}
+        for keyword in self.keywords:
+            if cap is None:
+                count = text.count(keyword)
+            else:
+                count = _capped_count(text, keyword, cap)
+            if count:
+                counts[keyword] = count
+        return counts
+
+
+    def contains_any(self, text: str) -> bool:
+        """키워드가 하나라도 등장하는지 확인 (첫 매칭에서 중단)"""
+        if self._automaton is not None:
+            for _ in self._automaton.iter(text):
+                return True
+            return False
+
+        return any(keyword in text for keyword in self.keywords)
+
+
+def _capped_count(text: str, needle: str, cap: int) -> int:
+    """겹치지 않는 출현 횟수를 cap개까지만 센다 (cap에 닿으면 탐색 중단)"""
+    count = 0
+    start = 0
+    step = len(needle)
+    while count < cap:
+        index = text.find(needle, start)
+        if index < 0:
+            break
+        count += 1
+        start = index + step
+    return count
@@ -0,0 +1,30 @@
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# 외부 LLM/번역 API 호출에 공유하는 HTTP 세션 (keep-alive 연결 풀 재사용)
+_llm_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_llm_session() -> aiohttp.ClientSession:
+    """공유 HTTP 세션 반환 (최초 사용 시 실행 중인 이벤트 루프에서 생성)"""
+    global _llm_session
+    if _llm_session is None or _llm_session.closed:
+        connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60)
+        _llm_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        logger.debug("Shared LLM HTTP session created")
+    return _llm_session
+
+
+async def close_llm_session():
+    """공유 HTTP 세션 정리"""
+    global _llm_session
+    if _llm_session is not None and not _llm_session.closed:
+        await _llm_session.close()
+    _llm_session = None
@@ -1,25 +1,51 @@
 import asyncio
+import itertools
 import smtplib
 import json
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import os
+import tempfile
 from datetime import datetime
 
 from agent_base import BaseAgent, AgentMessage, CategorizedNews, TranslatedNews, NewsItem, message_broker
 
 try:
-    from jinja2 import Template
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from jinja2 import Environment
+    from markupsafe import Markup, escape
     JINJA2_AVAILABLE = True
 except ImportError:
     JINJA2_AVAILABLE = False
     print("Warning: Jinja2 not installed. Email templates will be basic.")
 
 
+# Jinja2가 없을 때 사용하는 간단한 HTML 조각
+_NL = "\n"
+_SIMPLE_HTML_HEADER = "<html><body><h2>🤖 AI 뉴스 알림</h2><p>📅 {date}</p><hr>"
+_SIMPLE_HTML_ITEM = (
+    "<h3>{title}</h3>"
+    "<p><strong>카테고리:</strong> {category} | "
+    "<strong>트렌드:</strong> {trend_level}</p>"
+    "<p><strong>요약:</strong><br>{summary}</p>"
+    "{key_points}"
+    "<p><a href='{url}'>📰 원문 기사 보기</a></p><hr>"
+)
+_SIMPLE_HTML_FOOTER = (
+    "<p><em>이 메일은 AI 뉴스 알림 서비스에서 자동으로 발송되었습니다.</em></p>"
+    "</body></html>"
+)
+
+
 class MailSenderAgent(BaseAgent):
     """이메일 뉴스 발신 에이전트"""
     
@@ -38,7 +64,10 @@ class MailSenderAgent(BaseAgent):
         self.sender_name = os.getenv("SENDER_NAME", "AI 뉴스 알림")
         
         # 수신자 관리
+        self.recipients_file = "email_recipients.json"
         self.recipients = set()
+        # 전송용 수신자 스냅샷 (수신자 목록이 바뀔 때만 다시 생성, 순서 고정)
+        self._recipients_snapshot: Tuple[str, ...] = ()
         self.load_recipients()
         
         # 전송 설정
@@ -50,23 +79,31 @@ class MailSenderAgent(BaseAgent):
         self.error_count = 0
         self.last_send_time = None
         
-        # 템플릿
+        # 템플릿 (한 번만 컴파일해 재사용)
         self.email_template = self.get_email_template()
+        self._template = self.compile_template(self.email_template) if JINJA2_AVAILABLE else None
     
     def load_recipients(self):
         """수신자 목록 로드"""
         try:
             # 파일에서 수신자 목록 로드
-            if os.path.exists("email_recipients.json"):
-                with open("email_recipients.json", "r") as f:
-                    recipients_data = json.load(f)
-                    self.recipients = set(recipients_data.get("recipients", []))
+            if os.path.exists(self.recipients_file):
+                with open(self.recipients_file, "rb") as f:
+                    raw = f.read()
+                recipients_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                self.recipients = set(recipients_data.get("recipients", []))
+            
+            self._refresh_recipients_snapshot()
             
             self.logger.info(f"Loaded {len(self.recipients)} email recipients")
             
         except Exception as e:
             self.logger.error(f"Error loading recipients: {e}")
     
+    def _refresh_recipients_snapshot(self):
+        """수신자 스냅샷 재생성"""
+        self._recipients_snapshot = tuple(sorted(self.recipients))
+    
     def save_recipients(self):
         """수신자 목록 저장"""
         try:
@@ -75,12 +112,31 @@ class MailSenderAgent(BaseAgent):
                 "updated_at": datetime.now().isoformat()
             }
             
-            with open("email_recipients.json", "w") as f:
-                json.dump(recipients_data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(recipients_data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(recipients_data, indent=2).encode()
+            
+            # 임시 파일에 쓴 뒤 교체해 저장 중 중단되어도 기존 목록이 깨지지 않도록 함
+            directory = os.path.dirname(os.path.abspath(self.recipients_file))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.recipients_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
                 
         except Exception as e:
             self.logger.error(f"Error saving recipients: {e}")
     
+    def compile_template(self, source: str):
+        """Jinja2 템플릿 컴파일 (자동 이스케이프, 줄바꿈 → <br> 필터 등록)"""
+        env = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+        env.filters["nl2br"] = _nl2br
+        return env.from_string(source)
+    
     def get_email_template(self) -> str:
         """이메일 템플릿 반환"""
         if JINJA2_AVAILABLE:
@@ -183,13 +239,11 @@ AI 뉴스 알림 서비스
         """에이전트 메인 실행 로직"""
         while self.running:
             try:
-                # 메시지 처리
+                # 메시지 처리 (메시지가 올 때까지 대기하므로 별도 sleep 불필요)
                 message = await self.receive_message()
                 if message:
                     await self.process_message(message)
                 
-                await asyncio.sleep(1)
-                
             except Exception as e:
                 self.error_count += 1
                 self.logger.error(f"Error in mail sender agent: {e}")
@@ -213,8 +267,8 @@ AI 뉴스 알림 서비스
     async def send_news_message(self, message: AgentMessage):
         """단일 뉴스 메시지 전송"""
         try:
-            categorized_news_data = message.data["categorized_news"]
-            categorized_news = CategorizedNews(**categorized_news_data)
+            # 모델 객체는 재검증 없이 그대로, dict는 검증 후 변환
+            categorized_news = CategorizedNews.model_validate(message.data["categorized_news"])
             
             # 이메일 내용 포맷팅
             email_data = self.format_single_news(categorized_news)
@@ -239,7 +293,7 @@ AI 뉴스 알림 서비스
         """뉴스 다이제스트 전송"""
         try:
             news_items_data = message.data.get("news_items", [])
-            news_items = [CategorizedNews(**item) for item in news_items_data]
+            news_items = [CategorizedNews.model_validate(item) for item in news_items_data]
             
             if not news_items:
                 self.logger.warning("No news items to send in digest")
@@ -292,8 +346,7 @@ AI 뉴스 알림 서비스
         }
         
         if JINJA2_AVAILABLE:
-            template = Template(self.email_template)
-            html_content = template.render(news_items=[template_data], date=template_data['date'])
+            html_content = self._template.render(news_items=[template_data], date=template_data['date'])
             text_content = self.generate_text_version([template_data])
         else:
             html_content = self.generate_simple_html([template_data])
@@ -336,8 +389,7 @@ AI 뉴스 알림 서비스
         template_data_list.sort(key=lambda x: x['importance'], reverse=True)
         
         if JINJA2_AVAILABLE:
-            template = Template(self.email_template)
-            html_content = template.render(
+            html_content = self._template.render(
                 news_items=template_data_list, 
                 date=datetime.now().strftime("%Y년 %m월 %d일")
             )
@@ -353,34 +405,29 @@ AI 뉴스 알림 서비스
     
     def generate_simple_html(self, news_items: List[Dict]) -> str:
         """간단한 HTML 생성"""
-        html_parts = [
-            "<html><body>",
-            "<h2>🤖 AI 뉴스 알림</h2>",
-            f"<p>📅 {datetime.now().strftime('%Y년 %m월 %d일')}</p><hr>"
-        ]
+        html_parts = [_SIMPLE_HTML_HEADER.format(date=datetime.now().strftime('%Y년 %m월 %d일'))]
         
         for item in news_items:
-            html_parts.extend([
-                f"<h3>{item['title']}</h3>",
-                f"<p><strong>카테고리:</strong> {item['category']} | ",
-                f"<strong>트렌드:</strong> {item['trend_level'].upper()}</p>",
-                f"<p><strong>요약:</strong><br>{item['summary'].replace(chr(10), '<br>')}</p>"
-            ])
-            
-            if item.get('key_points'):
-                html_parts.append("<p><strong>주요 포인트:</strong><ul>")
-                for point in item['key_points'][:3]:
-                    html_parts.append(f"<li>{point}</li>")
-                html_parts.append("</ul></p>")
+            key_points = item.get('key_points')
+            if key_points:
+                key_points_html = "".join(
+                    ["<p><strong>주요 포인트:</strong><ul>"]
+                    + [f"<li>{point}</li>" for point in key_points[:3]]
+                    + ["</ul></p>"]
+                )
+            else:
+                key_points_html = ""
             
-            html_parts.extend([
-                f"<p><a href='{item['url']}'>📰 원문 기사 보기</a></p><hr>"
-            ])
+            html_parts.append(_SIMPLE_HTML_ITEM.format(
+                title=item['title'],
+                category=item['category'],
+                trend_level=item['trend_level'].upper(),
+                summary=item['summary'].replace(_NL, '<br>'),
+                key_points=key_points_html,
+                url=item['url']
+            ))
         
-        html_parts.extend([
-            "<p><em>이 메일은 AI 뉴스 알림 서비스에서 자동으로 발송되었습니다.</em></p>",
-            "</body></html>"
-        ])
+        html_parts.append(_SIMPLE_HTML_FOOTER)
         
         return "".join(html_parts)
     
@@ -431,40 +478,64 @@ AI 뉴스 알림 서비스
         
         sent_count = 0
         
-        # 수신자를 배치로 나누어 전송
-        recipient_list = list(self.recipients)
-        for i in range(0, len(recipient_list), self.batch_size):
-            batch = recipient_list[i:i + self.batch_size]
-            
-            for recipient in batch:
-                try:
-                    await self.send_single_email(
-                        to_email=recipient,
-                        subject=subject,
-                        html_content=html_content,
-                        text_content=text_content
-                    )
-                    sent_count += 1
-                    
-                    # 전송 간격
-                    await asyncio.sleep(self.send_interval)
-                    
-                except Exception as e:
-                    self.error_count += 1
-                    self.logger.error(f"Failed to send email to {recipient}: {e}")
-            
-            # 배치 간 대기
-            if i + self.batch_size < len(recipient_list):
-                await asyncio.sleep(self.send_interval * 2)
+        # 본문은 모든 수신자에게 같으므로 MIME 메시지는 한 번만 생성
+        msg = self.build_message(subject, html_content, text_content)
+        
+        # SMTP 연결은 전체 전송 동안 하나만 유지 (오류가 나면 다음 수신자부터 재연결)
+        # smtplib는 블로킹이므로 연결·전송은 워커 스레드에서 실행
+        server: Optional[smtplib.SMTP] = None
+        
+        try:
+            # 수신자를 배치로 나누어 전송 (스냅샷을 순서대로 잘라 읽어 전체 목록을 복사하지 않음)
+            recipients = iter(self._recipients_snapshot)
+            remaining = len(self._recipients_snapshot)
+            while True:
+                batch = list(itertools.islice(recipients, self.batch_size))
+                if not batch:
+                    break
+                remaining -= len(batch)
+                
+                for recipient in batch:
+                    try:
+                        if server is None:
+                            server = await asyncio.to_thread(self.open_smtp)
+                        
+                        try:
+                            await asyncio.to_thread(self.send_on, server, msg, recipient)
+                        except smtplib.SMTPServerDisconnected:
+                            # 대기 중 서버가 연결을 끊은 경우 한 번 재연결 후 재시도
+                            await asyncio.to_thread(self.close_smtp, server)
+                            server = await asyncio.to_thread(self.open_smtp)
+                            await asyncio.to_thread(self.send_on, server, msg, recipient)
+                        
+                        sent_count += 1
+                        
+                        # 전송 간격
+                        await asyncio.sleep(self.send_interval)
+                        
+                    except Exception as e:
+                        self.error_count += 1
+                        self.logger.error(f"Failed to send email to {recipient}: {e}")
+                        await asyncio.to_thread(self.close_smtp, server)
+                        server = None
+                
+                # 배치 간 대기
+                if remaining > 0:
+                    await asyncio.sleep(self.send_interval * 2)
+        finally:
+            await asyncio.to_thread(self.close_smtp, server)
         
         return sent_count
     
     async def send_single_email(self, to_email: str, subject: str, html_content: str, text_content: str):
         """단일 이메일 전송"""
-        # 메시지 생성
+        msg = self.build_message(subject, html_content, text_content)
+        await self.deliver_message(msg, to_email)
+    
+    def build_message(self, subject: str, html_content: str, text_content: str) -> MIMEMultipart:
+        """수신자(To)를 제외한 MIME 메시지 생성"""
         msg = MIMEMultipart('alternative')
         msg['From'] = f"{self.sender_name} <{self.sender_email}>"
-        msg['To'] = to_email
         msg['Subject'] = subject
         
         # 텍스트 파트
@@ -475,18 +546,52 @@ AI 뉴스 알림 서비스
         html_part = MIMEText(html_content, 'html', 'utf-8')
         msg.attach(html_part)
         
-        # SMTP 연결 및 전송
-        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+        return msg
+    
+    async def deliver_message(self, msg: MIMEMultipart, to_email: str):
+        """새 SMTP 연결로 메시지 전송 (이벤트 루프를 막지 않도록 워커 스레드에서 실행)"""
+        await asyncio.to_thread(self._deliver_blocking, msg, to_email)
+    
+    def _deliver_blocking(self, msg: MIMEMultipart, to_email: str):
+        server = self.open_smtp()
+        try:
+            self.send_on(server, msg, to_email)
+        finally:
+            self.close_smtp(server)
+    
+    def open_smtp(self) -> smtplib.SMTP:
+        """SMTP 연결 및 로그인"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
             if self.smtp_use_tls:
                 server.starttls()
             
             server.login(self.smtp_username, self.smtp_password)
-            server.send_message(msg)
+        except Exception:
+            self.close_smtp(server)
+            raise
+        return server
+    
+    def send_on(self, server: smtplib.SMTP, msg: MIMEMultipart, to_email: str):
+        """열려 있는 SMTP 연결로 수신자만 바꿔 전송"""
+        del msg['To']
+        msg['To'] = to_email
+        server.send_message(msg)
+    
+    def close_smtp(self, server: Optional[smtplib.SMTP]):
+        """SMTP 연결 종료 (이미 끊긴 연결도 조용히 정리)"""
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
     
     async def add_recipient(self, email: str) -> bool:
         """수신자 추가"""
         if email and email not in self.recipients:
             self.recipients.add(email)
+            self._refresh_recipients_snapshot()
             self.save_recipients()
             self.logger.info(f"Added email recipient: {email}")
             return True
@@ -496,6 +601,7 @@ AI 뉴스 알림 서비스
         """수신자 제거"""
         if email in self.recipients:
             self.recipients.remove(email)
+            self._refresh_recipients_snapshot()
             self.save_recipients()
             self.logger.info(f"Removed email recipient: {email}")
             return True
@@ -531,6 +637,11 @@ AI 뉴스 알림 서비스
         })
 
 
+def _nl2br(value: str) -> "Markup":
+    """줄바꿈을 <br>로 변환 (내용은 HTML 이스케이프)"""
+    return Markup("<br>\n").join(escape(value).split("\n"))
+
+
 # MailSenderAgent 인스턴스 생성 및 등록
 mail_sender_agent = MailSenderAgent()
-message_broker.register_agent(mail_sender_agent)
\ No newline at end of file
+message_broker.register_agent(mail_sender_agent, single_consumer=True)
\ No newline at end of file
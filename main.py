@@ -1,11 +1,15 @@
 import asyncio
+import functools
 import os
 import sys
-from typing import Any, Dict, List
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 
 from dotenv import load_dotenv
-from pydantic import BaseModel
 import telegram
+from telegram.request import HTTPXRequest
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
@@ -18,264 +22,340 @@ from mcp.types import (
     Tool,
 )
 
+try:
+    import h2  # noqa: F401 (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import aiolimiter  # noqa: F401 (required by AIORateLimiter)
+    from telegram.ext import AIORateLimiter, ExtBot
+    RATE_LIMITER_AVAILABLE = True
+except ImportError:
+    RATE_LIMITER_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+# Photo/document arguments starting with these are sent as URLs, anything else is a local path
+_URL_PREFIXES = ('http://', 'https://')
+
+
+async def _open_upload(path: str) -> telegram.InputFile:
+    """Open a local file for upload; httpx streams it in chunks (caller closes it)"""
+    upload_path = Path(path)
+    handle = await asyncio.to_thread(upload_path.open, "rb")
+    return telegram.InputFile(handle, filename=upload_path.name, read_file_handle=False)
+
+
+class _Sender(NamedTuple):
+    method: str  # Bot method name
+    content_key: str  # argument holding the text/photo/document
+    label: str  # used in the success reply
+    options: Tuple[Tuple[str, Any], ...]  # optional arguments and their defaults
+    uploads_files: bool  # content may be a local file path
+
+
+# Tool name -> how to send it
+_SENDERS: Dict[str, _Sender] = {
+    "send_message": _Sender(
+        "send_message", "text", "Message",
+        (("parse_mode", None), ("disable_notification", False)), False
+    ),
+    "send_photo": _Sender(
+        "send_photo", "photo", "Photo",
+        (("caption", None), ("parse_mode", None)), True
+    ),
+    "send_document": _Sender(
+        "send_document", "document", "Document",
+        (("caption", None), ("parse_mode", None)), True
+    ),
+}
 
-class Settings(BaseModel):
+
+def _sent_file_id(message: telegram.Message, media_key: str) -> Optional[str]:
+    """file_id of the media in a sent message (largest size for photos)"""
+    media = getattr(message, media_key, None)
+    if isinstance(media, (tuple, list)):
+        media = media[-1] if media else None
+    return media.file_id if media is not None else None
+
+
+def _text_result(text: str, is_error: bool = False) -> CallToolResult:
+    """Wrap a text message in a tool result"""
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=is_error)
+
+
+def _parse_chat_ids(raw: str) -> FrozenSet[int]:
+    """Parse the comma-separated ALLOWED_CHAT_IDS value"""
+    raw = raw.strip()
+    if not raw:
+        return frozenset()  # Unset/empty: no restriction, nothing to split
+    return frozenset(int(part) for part in raw.split(",") if part.strip())
+
+
+@dataclass(slots=True, frozen=True)
+class Settings:
     bot_token: str
-    allowed_chat_ids: List[int] = []
+    allowed_chat_ids: FrozenSet[int] = frozenset()
     log_level: str = "INFO"
 
 
 class TelegramMCPServer:
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.bot = telegram.Bot(token=settings.bot_token)
+        # Allowed chats as a set for O(1) lookups (empty means no restriction)
+        self._allowed_chat_ids = settings.allowed_chat_ids
+        # One Bot with a pooled, keep-alive HTTP client is shared by every tool call
+        request = HTTPXRequest(
+            connection_pool_size=64,
+            http_version="2" if HTTP2_AVAILABLE else "1.1"
+        )
+        if RATE_LIMITER_AVAILABLE:
+            # Pace sends below Telegram's flood limits (30 msg/s overall, 20 msg/min per group)
+            self.bot = ExtBot(
+                token=settings.bot_token,
+                request=request,
+                rate_limiter=AIORateLimiter(
+                    overall_max_rate=30,
+                    overall_time_period=1,
+                    group_max_rate=20,
+                    group_time_period=60
+                )
+            )
+        else:
+            self.bot = telegram.Bot(token=settings.bot_token, request=request)
+        # Outgoing sends go through one FIFO queue drained by a fixed set of workers
+        self.send_workers = 8
+        self._send_queue: "asyncio.Queue[Tuple[Callable[[], Awaitable[Any]], asyncio.Future]]" = asyncio.Queue()
+        self._send_tasks: List[asyncio.Task] = []
+        # (tool, media URL) -> Telegram file_id, so repeated URLs are not re-downloaded by Telegram
+        self.file_id_cache_size = 1024
+        self._file_ids: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
         self.server = Server("telegram-mcp-server")
+        self._tools = self._build_tools()
+        self._dispatch = {
+            tool: functools.partial(self._do_send, tool) for tool in _SENDERS
+        }
         self._setup_handlers()
     
-    def _setup_handlers(self):
-        @self.server.list_tools()
-        async def handle_list_tools() -> List[Tool]:
-            return [
-                Tool(
-                    name="send_message",
-                    description="Send a message to a Telegram chat",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "chat_id": {
-                                "type": "integer",
-                                "description": "Telegram chat ID to send message to"
-                            },
-                            "text": {
-                                "type": "string",
-                                "description": "Message text content"
-                            },
-                            "parse_mode": {
-                                "type": "string",
-                                "enum": ["HTML", "Markdown", "MarkdownV2"],
-                                "description": "Message parsing mode"
-                            },
-                            "disable_notification": {
-                                "type": "boolean",
-                                "description": "Send message silently",
-                                "default": False
-                            }
+    @staticmethod
+    def _build_tools() -> List[Tool]:
+        """Build the static tool list (schemas never change, so this runs once)"""
+        return [
+            Tool(
+                name="send_message",
+                description="Send a message to a Telegram chat",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "chat_id": {
+                            "type": "integer",
+                            "description": "Telegram chat ID to send message to"
                         },
-                        "required": ["chat_id", "text"]
-                    }
-                ),
-                Tool(
-                    name="send_photo",
-                    description="Send a photo to a Telegram chat",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "chat_id": {
-                                "type": "integer",
-                                "description": "Telegram chat ID to send photo to"
-                            },
-                            "photo": {
-                                "type": "string",
-                                "description": "Photo URL or local file path"
-                            },
-                            "caption": {
-                                "type": "string",
-                                "description": "Photo caption"
-                            },
-                            "parse_mode": {
-                                "type": "string",
-                                "enum": ["HTML", "Markdown", "MarkdownV2"],
-                                "description": "Caption parsing mode"
-                            }
+                        "text": {
+                            "type": "string",
+                            "description": "Message text content"
                         },
-                        "required": ["chat_id", "photo"]
-                    }
-                ),
-                Tool(
-                    name="send_document",
-                    description="Send a document to a Telegram chat",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "chat_id": {
-                                "type": "integer",
-                                "description": "Telegram chat ID to send document to"
-                            },
-                            "document": {
-                                "type": "string",
-                                "description": "Document URL or local file path"
-                            },
-                            "caption": {
-                                "type": "string",
-                                "description": "Document caption"
-                            },
-                            "parse_mode": {
-                                "type": "string",
-                                "enum": ["HTML", "Markdown", "MarkdownV2"],
-                                "description": "Caption parsing mode"
-                            }
+                        "parse_mode": {
+                            "type": "string",
+                            "enum": ["HTML", "Markdown", "MarkdownV2"],
+                            "description": "Message parsing mode"
                         },
-                        "required": ["chat_id", "document"]
-                    }
-                )
-            ]
+                        "disable_notification": {
+                            "type": "boolean",
+                            "description": "Send message silently",
+                            "default": False
+                        }
+                    },
+                    "required": ["chat_id", "text"]
+                }
+            ),
+            Tool(
+                name="send_photo",
+                description="Send a photo to a Telegram chat",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "chat_id": {
+                            "type": "integer",
+                            "description": "Telegram chat ID to send photo to"
+                        },
+                        "photo": {
+                            "type": "string",
+                            "description": "Photo URL or local file path"
+                        },
+                        "caption": {
+                            "type": "string",
+                            "description": "Photo caption"
+                        },
+                        "parse_mode": {
+                            "type": "string",
+                            "enum": ["HTML", "Markdown", "MarkdownV2"],
+                            "description": "Caption parsing mode"
+                        }
+                    },
+                    "required": ["chat_id", "photo"]
+                }
+            ),
+            Tool(
+                name="send_document",
+                description="Send a document to a Telegram chat",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "chat_id": {
+                            "type": "integer",
+                            "description": "Telegram chat ID to send document to"
+                        },
+                        "document": {
+                            "type": "string",
+                            "description": "Document URL or local file path"
+                        },
+                        "caption": {
+                            "type": "string",
+                            "description": "Document caption"
+                        },
+                        "parse_mode": {
+                            "type": "string",
+                            "enum": ["HTML", "Markdown", "MarkdownV2"],
+                            "description": "Caption parsing mode"
+                        }
+                    },
+                    "required": ["chat_id", "document"]
+                }
+            )
+        ]
+    
+    def _setup_handlers(self):
+        @self.server.list_tools()
+        async def handle_list_tools() -> List[Tool]:
+            return self._tools
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
             try:
-                if name == "send_message":
-                    return await self._send_message(arguments)
-                elif name == "send_photo":
-                    return await self._send_photo(arguments)
-                elif name == "send_document":
-                    return await self._send_document(arguments)
-                else:
-                    return CallToolResult(
-                        content=[TextContent(type="text", text=f"Unknown tool: {name}")],
-                        isError=True
-                    )
+                handler = self._dispatch.get(name)
+                if handler is None:
+                    return _text_result(f"Unknown tool: {name}", is_error=True)
+                return await handler(arguments)
             except Exception as e:
-                return CallToolResult(
-                    content=[TextContent(type="text", text=f"Error: {str(e)}")],
-                    isError=True
-                )
+                # Single error path for every tool (send failures included)
+                return _text_result(f"Failed to {name.replace('_', ' ')}: {str(e)}", is_error=True)
+    
+    async def _enqueue_send(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """Queue a Bot call and wait for the worker to run it"""
+        if not self._send_tasks:
+            self._send_tasks = [
+                asyncio.create_task(self._sender_loop()) for _ in range(self.send_workers)
+            ]
+        future = asyncio.get_running_loop().create_future()
+        await self._send_queue.put((send, future))
+        return await future
+    
+    async def _sender_loop(self):
+        """Run queued Bot calls in FIFO order and hand results back to their callers"""
+        # Bound once: this loop runs for every send
+        get_job = self._send_queue.get
+        task_done = self._send_queue.task_done
+        while True:
+            send, future = await get_job()
+            try:
+                if future.cancelled():
+                    continue
+                try:
+                    result = await send()
+                except Exception as e:
+                    if not future.cancelled():
+                        future.set_exception(e)
+                else:
+                    if not future.cancelled():
+                        future.set_result(result)
+            finally:
+                task_done()
+    
+    async def stop_senders(self):
+        """Cancel the send workers"""
+        for task in self._send_tasks:
+            task.cancel()
+        await asyncio.gather(*self._send_tasks, return_exceptions=True)
+        self._send_tasks = []
     
-    async def _validate_chat_id(self, chat_id: int) -> bool:
+    def _remember_file_id(self, key: Tuple[str, str], file_id: Optional[str]):
+        if file_id is None:
+            return
+        self._file_ids[key] = file_id
+        self._file_ids.move_to_end(key)
+        if len(self._file_ids) > self.file_id_cache_size:
+            self._file_ids.popitem(last=False)
+    
+    def _validate_chat_id(self, chat_id: int) -> bool:
         """Check if chat ID is allowed"""
-        if not self.settings.allowed_chat_ids:
+        if not self._allowed_chat_ids:
             return True  # If no restrictions, allow all
-        return chat_id in self.settings.allowed_chat_ids
+        return chat_id in self._allowed_chat_ids
     
-    async def _send_message(self, arguments: Dict[str, Any]) -> CallToolResult:
+    async def _do_send(self, tool: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """Shared send path for every tool in _SENDERS"""
+        sender = _SENDERS[tool]
         chat_id = arguments["chat_id"]
-        text = arguments["text"]
-        parse_mode = arguments.get("parse_mode")
-        disable_notification = arguments.get("disable_notification", False)
+        content = arguments[sender.content_key]
+        options = {name: arguments.get(name, default) for name, default in sender.options}
         
-        if not await self._validate_chat_id(chat_id):
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Chat ID {chat_id} is not allowed")],
-                isError=True
-            )
+        if not self._validate_chat_id(chat_id):
+            return _text_result(f"Chat ID {chat_id} is not allowed", is_error=True)
         
-        try:
-            message = await self.bot.send_message(
-                chat_id=chat_id,
-                text=text,
-                parse_mode=parse_mode,
-                disable_notification=disable_notification
-            )
-            
-            return CallToolResult(
-                content=[TextContent(
-                    type="text", 
-                    text=f"Message sent successfully to chat {chat_id}. Message ID: {message.message_id}"
-                )]
-            )
-        except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to send message: {str(e)}")],
-                isError=True
-            )
-    
-    async def _send_photo(self, arguments: Dict[str, Any]) -> CallToolResult:
-        chat_id = arguments["chat_id"]
-        photo = arguments["photo"]
-        caption = arguments.get("caption")
-        parse_mode = arguments.get("parse_mode")
+        send = functools.partial(getattr(self.bot, sender.method), chat_id=chat_id, **options)
         
-        if not await self._validate_chat_id(chat_id):
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Chat ID {chat_id} is not allowed")],
-                isError=True
-            )
+        # Check if content is a URL or local file
+        upload = None
+        cache_key = None
+        file_id = None
+        if sender.uploads_files:
+            if content.startswith(_URL_PREFIXES):
+                cache_key = (tool, content)
+                file_id = self._file_ids.get(cache_key)
+                if file_id is not None:
+                    self._file_ids.move_to_end(cache_key)
+            else:
+                # Local file (streamed from disk instead of loaded into memory)
+                upload = content = await _open_upload(content)
         
         try:
-            # Check if photo is a URL or local file
-            if photo.startswith(('http://', 'https://')):
-                message = await self.bot.send_photo(
-                    chat_id=chat_id,
-                    photo=photo,
-                    caption=caption,
-                    parse_mode=parse_mode
-                )
+            if file_id is None:
+                message = await self._enqueue_send(functools.partial(send, **{sender.content_key: content}))
             else:
-                # Local file
-                with open(photo, 'rb') as photo_file:
-                    message = await self.bot.send_photo(
-                        chat_id=chat_id,
-                        photo=photo_file,
-                        caption=caption,
-                        parse_mode=parse_mode
-                    )
-            
-            return CallToolResult(
-                content=[TextContent(
-                    type="text", 
-                    text=f"Photo sent successfully to chat {chat_id}. Message ID: {message.message_id}"
-                )]
-            )
-        except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to send photo: {str(e)}")],
-                isError=True
-            )
-    
-    async def _send_document(self, arguments: Dict[str, Any]) -> CallToolResult:
-        chat_id = arguments["chat_id"]
-        document = arguments["document"]
-        caption = arguments.get("caption")
-        parse_mode = arguments.get("parse_mode")
+                try:
+                    message = await self._enqueue_send(functools.partial(send, **{sender.content_key: file_id}))
+                except telegram.error.TelegramError as e:
+                    # A rejected file_id (e.g. after a bot token change) must not stick around
+                    self._file_ids.pop(cache_key, None)
+                    if not isinstance(e, telegram.error.BadRequest):
+                        raise
+                    # Telegram refused the file_id itself, so retry once with the original URL
+                    message = await self._enqueue_send(functools.partial(send, **{sender.content_key: content}))
+        finally:
+            if upload is not None:
+                upload.input_file_content.close()
         
-        if not await self._validate_chat_id(chat_id):
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Chat ID {chat_id} is not allowed")],
-                isError=True
-            )
+        if cache_key is not None:
+            self._remember_file_id(cache_key, _sent_file_id(message, sender.content_key))
         
-        try:
-            # Check if document is a URL or local file
-            if document.startswith(('http://', 'https://')):
-                message = await self.bot.send_document(
-                    chat_id=chat_id,
-                    document=document,
-                    caption=caption,
-                    parse_mode=parse_mode
-                )
-            else:
-                # Local file
-                with open(document, 'rb') as doc_file:
-                    message = await self.bot.send_document(
-                        chat_id=chat_id,
-                        document=doc_file,
-                        caption=caption,
-                        parse_mode=parse_mode
-                    )
-            
-            return CallToolResult(
-                content=[TextContent(
-                    type="text", 
-                    text=f"Document sent successfully to chat {chat_id}. Message ID: {message.message_id}"
-                )]
-            )
-        except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to send document: {str(e)}")],
-                isError=True
-            )
+        return _text_result(f"{sender.label} sent successfully to chat {chat_id}. Message ID: {message.message_id}")
 
 
 async def main():
     try:
         settings = Settings(
             bot_token=os.getenv("BOT_TOKEN", ""),
-            allowed_chat_ids=[
-                int(x.strip()) for x in os.getenv("ALLOWED_CHAT_IDS", "").split(",") 
-                if x.strip()
-            ],
+            allowed_chat_ids=_parse_chat_ids(os.getenv("ALLOWED_CHAT_IDS", "")),
             log_level=os.getenv("LOG_LEVEL", "INFO")
         )
         
@@ -285,19 +365,24 @@ async def main():
         
         mcp_server = TelegramMCPServer(settings)
         
-        async with stdio_server() as (read_stream, write_stream):
-            await mcp_server.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="telegram-mcp-server",
-                    server_version="1.0.0",
-                    capabilities=mcp_server.server.get_capabilities(
-                        notification_options=None,
-                        experimental_capabilities=None
+        # Keep the bot's connection pool open for the server's lifetime
+        async with mcp_server.bot:
+            try:
+                async with stdio_server() as (read_stream, write_stream):
+                    await mcp_server.server.run(
+                        read_stream,
+                        write_stream,
+                        InitializationOptions(
+                            server_name="telegram-mcp-server",
+                            server_version="1.0.0",
+                            capabilities=mcp_server.server.get_capabilities(
+                                notification_options=None,
+                                experimental_capabilities=None
+                            )
+                        )
                     )
-                )
-            )
+            finally:
+                await mcp_server.stop_senders()
     
     except Exception as e:
         print(f"Server error: {e}", file=sys.stderr)
@@ -305,4 +390,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Run on the libuv-based event loop when uvloop is installed
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -1,7 +1,12 @@
 import asyncio
+import logging
+import logging.handlers
 import os
+import queue
+import re
+import signal
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional
 
 from dotenv import load_dotenv
 from pydantic import BaseModel
@@ -14,6 +19,12 @@ from mcp.types import (
     Tool,
 )
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # 에이전트 임포트
 from agent_base import message_broker, AgentMessage
 from collector_agent import collector_agent
@@ -26,6 +37,20 @@ from mail_sender_agent import mail_sender_agent
 # 환경 변수 로드
 load_dotenv()
 
+logger = logging.getLogger("news_mcp")
+
+
+def _text_result(text: str, is_error: bool = False) -> CallToolResult:
+    """텍스트 응답 생성"""
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=is_error)
+
+
+# 구독 요청의 이메일 형식 검사 (기본 구조만 확인)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# 고정 문구 응답은 한 번만 만들어 재사용
+_TELEGRAM_UNAVAILABLE = _text_result("Telegram functionality is not available", is_error=True)
+
 
 class NewsMCPSettings(BaseModel):
     # 일반 설정
@@ -63,6 +88,16 @@ class NewsMCPSettings(BaseModel):
     openai_api_key: str = ""
     papago_client_id: str = ""
     papago_client_secret: str = ""
+    
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "NewsMCPSettings":
+        """환경 변수에서 설정 로드 (키는 필드 이름의 대문자, 형 변환은 Pydantic이 처리)"""
+        values = {
+            name: environ[name.upper()]
+            for name in cls.model_fields
+            if name.upper() in environ
+        }
+        return cls(**values)
 
 
 class NewsAlertMCPServer:
@@ -72,190 +107,253 @@ class NewsAlertMCPServer:
         self.settings = settings
         self.server = Server("news-alert-mcp-server")
         self.agents_started = False
+        self._start_task: Optional[asyncio.Task] = None
+        self._started_agents: List[Any] = []
+        self._agent_tasks: List[asyncio.Task] = []
+        self._tools = self._build_tools()
+        # 텔레그램 사용 여부는 실행 중 바뀌지 않으므로 한 번만 판단
+        self._telegram = telegram_sender_agent if settings.enable_telegram else None
+        # 상태 조회 대상 (없는 에이전트는 한 번만 걸러냄)
+        self._status_probes = tuple(
+            (name, agent) for name, agent in (
+                ("collector", collector_agent),
+                ("translator", translator_agent),
+                ("analyzer", analyzer_agent),
+                ("categorizer", categorizer_agent),
+                ("telegram-sender", telegram_sender_agent),
+                ("mail-sender", mail_sender_agent)
+            )
+            if agent
+        )
+        self._dispatch = {
+            "start_news_collection": self.start_news_collection,
+            "get_news_summary": self.get_news_summary,
+            "subscribe_telegram": self.subscribe_telegram if self._telegram else self._telegram_unavailable,
+            "subscribe_email": self.subscribe_email,
+            "configure_news_sources": self.configure_news_sources,
+            "get_agent_status": self.get_agent_status,
+            "send_test_notification": self.send_test_notification,
+        }
+        # 첫 호출에서 에이전트를 시작한 뒤 _handle_call_tool_hot으로 교체됨
+        self._handle_call_tool = self._handle_call_tool_cold
         self._setup_handlers()
     
-    def _setup_handlers(self):
-        """MCP 핸들러 설정"""
-        
-        @self.server.list_tools()
-        async def handle_list_tools() -> List[Tool]:
-            return [
-                Tool(
-                    name="start_news_collection",
-                    description="Start the news collection process",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "force": {
-                                "type": "boolean",
-                                "description": "Force immediate collection",
-                                "default": False
-                            }
-                        }
-                    }
-                ),
-                Tool(
-                    name="get_news_summary",
-                    description="Get latest AI trend news summary",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of news items to return",
-                                "default": 10
-                            },
-                            "category": {
-                                "type": "string",
-                                "description": "Filter by category"
-                            },
-                            "trend_level": {
-                                "type": "string",
-                                "enum": ["high", "medium", "low"],
-                                "description": "Filter by trend level"
-                            }
+    @staticmethod
+    def _build_tools() -> List[Tool]:
+        """정적 도구 목록 생성 (스키마가 바뀌지 않으므로 한 번만 실행)"""
+        return [
+            Tool(
+                name="start_news_collection",
+                description="Start the news collection process",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "force": {
+                            "type": "boolean",
+                            "description": "Force immediate collection",
+                            "default": False
                         }
                     }
-                ),
-                Tool(
-                    name="subscribe_telegram",
-                    description="Subscribe to Telegram news alerts",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "chat_id": {
-                                "type": "integer",
-                                "description": "Telegram chat ID"
-                            }
+                }
+            ),
+            Tool(
+                name="get_news_summary",
+                description="Get latest AI trend news summary",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "limit": {
+                            "type": "integer",
+                            "description": "Number of news items to return",
+                            "default": 10
                         },
-                        "required": ["chat_id"]
-                    }
-                ),
-                Tool(
-                    name="subscribe_email",
-                    description="Subscribe to email news alerts",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "email": {
-                                "type": "string",
-                                "format": "email",
-                                "description": "Email address"
-                            }
+                        "category": {
+                            "type": "string",
+                            "description": "Filter by category"
                         },
-                        "required": ["email"]
-                    }
-                ),
-                Tool(
-                    name="configure_news_sources",
-                    description="Configure news collection sources",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "enable_domestic": {
-                                "type": "boolean",
-                                "description": "Enable domestic news collection"
-                            },
-                            "enable_international": {
-                                "type": "boolean", 
-                                "description": "Enable international news collection"
-                            }
+                        "trend_level": {
+                            "type": "string",
+                            "enum": ["high", "medium", "low"],
+                            "description": "Filter by trend level"
                         }
                     }
-                ),
-                Tool(
-                    name="get_agent_status",
-                    description="Get status of all agents",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
+                }
+            ),
+            Tool(
+                name="subscribe_telegram",
+                description="Subscribe to Telegram news alerts",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "chat_id": {
+                            "type": "integer",
+                            "description": "Telegram chat ID"
+                        }
+                    },
+                    "required": ["chat_id"]
+                }
+            ),
+            Tool(
+                name="subscribe_email",
+                description="Subscribe to email news alerts",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "email": {
+                            "type": "string",
+                            "format": "email",
+                            "description": "Email address"
+                        }
+                    },
+                    "required": ["email"]
+                }
+            ),
+            Tool(
+                name="configure_news_sources",
+                description="Configure news collection sources",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "enable_domestic": {
+                            "type": "boolean",
+                            "description": "Enable domestic news collection"
+                        },
+                        "enable_international": {
+                            "type": "boolean", 
+                            "description": "Enable international news collection"
+                        }
                     }
-                ),
-                Tool(
-                    name="send_test_notification",
-                    description="Send test notification to configured channels",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "channel": {
-                                "type": "string",
-                                "enum": ["telegram", "email", "all"],
-                                "description": "Channel to send test notification",
-                                "default": "all"
-                            }
+                }
+            ),
+            Tool(
+                name="get_agent_status",
+                description="Get status of all agents",
+                inputSchema={
+                    "type": "object",
+                    "properties": {}
+                }
+            ),
+            Tool(
+                name="send_test_notification",
+                description="Send test notification to configured channels",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "channel": {
+                            "type": "string",
+                            "enum": ["telegram", "email", "all"],
+                            "description": "Channel to send test notification",
+                            "default": "all"
                         }
                     }
-                )
-            ]
+                }
+            )
+        ]
+    
+    def _setup_handlers(self):
+        """MCP 핸들러 설정"""
+        
+        @self.server.list_tools()
+        async def handle_list_tools() -> List[Tool]:
+            return self._tools
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
-            try:
-                if not self.agents_started:
-                    await self.start_agents()
-                
-                if name == "start_news_collection":
-                    return await self.start_news_collection(arguments)
-                elif name == "get_news_summary":
-                    return await self.get_news_summary(arguments)
-                elif name == "subscribe_telegram":
-                    return await self.subscribe_telegram(arguments)
-                elif name == "subscribe_email":
-                    return await self.subscribe_email(arguments)
-                elif name == "configure_news_sources":
-                    return await self.configure_news_sources(arguments)
-                elif name == "get_agent_status":
-                    return await self.get_agent_status(arguments)
-                elif name == "send_test_notification":
-                    return await self.send_test_notification(arguments)
-                else:
-                    return CallToolResult(
-                        content=[TextContent(type="text", text=f"Unknown tool: {name}")],
-                        isError=True
-                    )
-            except Exception as e:
-                return CallToolResult(
-                    content=[TextContent(type="text", text=f"Error: {str(e)}")],
-                    isError=True
-                )
+            return await self._handle_call_tool(name, arguments)
+    
+    async def _handle_call_tool_cold(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """에이전트 시작 전 도구 호출 (시작이 끝나면 이후 호출은 hot 경로로 전환)"""
+        try:
+            await self._ensure_agents_started()
+        except Exception as e:
+            return _text_result(f"Error: {str(e)}", is_error=True)
+        
+        self._handle_call_tool = self._handle_call_tool_hot
+        return await self._handle_call_tool_hot(name, arguments)
+    
+    async def _handle_call_tool_hot(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """에이전트 시작 후 도구 호출"""
+        try:
+            handler = self._dispatch.get(name)
+            if handler is None:
+                return _text_result(f"Unknown tool: {name}", is_error=True)
+            return await handler(arguments)
+        except Exception as e:
+            return _text_result(f"Error: {str(e)}", is_error=True)
+    
+    async def _ensure_agents_started(self):
+        """에이전트를 한 번만 시작 (동시에 들어온 첫 호출들은 같은 시작 태스크를 기다림)"""
+        task = self._start_task
+        if task is None:
+            task = self._start_task = asyncio.create_task(self.start_agents())
+        try:
+            await task
+        except Exception:
+            # 시작에 실패하면 다음 호출에서 다시 시도
+            if self._start_task is task:
+                self._start_task = None
+            raise
     
     async def start_agents(self):
         """모든 에이전트 시작"""
         try:
-            # Collector Agent 시작
-            asyncio.create_task(collector_agent.start())
-            await asyncio.sleep(0.1)
-            
-            # Translator Agent 시작 (번역 활성화된 경우)
+            # Collector, Analyzer, Categorizer는 항상 실행, 나머지는 설정에 따라 실행
+            agents = [collector_agent]
             if self.settings.enable_translation:
-                asyncio.create_task(translator_agent.start())
-                await asyncio.sleep(0.1)
-            
-            # Analyzer Agent 시작
-            asyncio.create_task(analyzer_agent.start())
-            await asyncio.sleep(0.1)
-            
-            # Categorizer Agent 시작
-            asyncio.create_task(categorizer_agent.start())
-            await asyncio.sleep(0.1)
+                agents.append(translator_agent)
+            agents += [analyzer_agent, categorizer_agent]
+            if self._telegram:
+                agents.append(self._telegram)
+            if self.settings.enable_email:
+                agents.append(mail_sender_agent)
             
-            # Telegram Sender Agent 시작 (텔레그램 활성화된 경우)
-            if self.settings.enable_telegram and telegram_sender_agent:
-                asyncio.create_task(telegram_sender_agent.start())
-                await asyncio.sleep(0.1)
+            # 태스크 참조를 보관해야 실행 중에 GC되지 않음
+            self._started_agents = agents
+            self._agent_tasks = [
+                asyncio.create_task(agent.start(), name=f"agent:{agent.name}")
+                for agent in agents
+            ]
             
-            # Mail Sender Agent 시작 (이메일 활성화된 경우)
-            if self.settings.enable_email:
-                asyncio.create_task(mail_sender_agent.start())
-                await asyncio.sleep(0.1)
+            # 고정 대기 대신 각 에이전트가 메시지 루프에 진입할 때까지 대기
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(agent.ready.wait() for agent in agents)),
+                    timeout=5
+                )
+            except asyncio.TimeoutError:
+                pending = [agent.name for agent in agents if not agent.ready.is_set()]
+                logger.warning(f"Agents not ready after 5s: {', '.join(pending)}")
             
             self.agents_started = True
-            print("All agents started successfully")
+            logger.info("All agents started successfully")
             
-        except Exception as e:
-            print(f"Error starting agents: {e}")
+        except Exception:
+            logger.exception("Error starting agents")
             raise
     
+    async def shutdown(self, timeout: float = 5):
+        """에이전트 중지 후 남은 태스크 정리 (태스크에서 발생한 예외도 여기서 기록)"""
+        for agent in self._started_agents:
+            try:
+                await agent.stop()
+            except Exception as e:
+                logger.error(f"Error stopping agent {agent.name}: {e}")
+        
+        if self._agent_tasks:
+            _, pending = await asyncio.wait(self._agent_tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            results = await asyncio.gather(*self._agent_tasks, return_exceptions=True)
+            for task, result in zip(self._agent_tasks, results):
+                if isinstance(result, Exception):
+                    logger.error(f"{task.get_name()} failed: {result}")
+        
+        self._started_agents = []
+        self._agent_tasks = []
+        self.agents_started = False
+        self._start_task = None
+        self._handle_call_tool = self._handle_call_tool_cold
+    
     async def start_news_collection(self, arguments: Dict[str, Any]) -> CallToolResult:
         """뉴스 수집 시작"""
         try:
@@ -272,18 +370,10 @@ class NewsAlertMCPServer:
                     )
                 )
             
-            return CallToolResult(
-                content=[TextContent(
-                    type="text",
-                    text=f"News collection {'forced ' if force else ''}started. Collection interval: {self.settings.collection_interval} seconds"
-                )]
-            )
+            return _text_result(f"News collection {'forced ' if force else ''}started. Collection interval: {self.settings.collection_interval} seconds")
             
         except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to start collection: {str(e)}")],
-                isError=True
-            )
+            return _text_result(f"Failed to start collection: {str(e)}", is_error=True)
     
     async def get_news_summary(self, arguments: Dict[str, Any]) -> CallToolResult:
         """최신 뉴스 요약"""
@@ -302,65 +392,50 @@ class NewsAlertMCPServer:
                 summary_text += f"- Trend Level: {trend_level}\n"
             summary_text += "\nNews collection is running in the background. News will be sent to your subscribed channels."
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=summary_text)]
-            )
+            return _text_result(summary_text)
             
         except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to get news summary: {str(e)}")],
-                isError=True
-            )
+            return _text_result(f"Failed to get news summary: {str(e)}", is_error=True)
+    
+    async def _telegram_unavailable(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """텔레그램이 비활성화된 경우의 subscribe_telegram"""
+        return _TELEGRAM_UNAVAILABLE
     
     async def subscribe_telegram(self, arguments: Dict[str, Any]) -> CallToolResult:
         """텔레그램 구독"""
         try:
             chat_id = arguments["chat_id"]
             
-            if telegram_sender_agent:
-                success = await telegram_sender_agent.add_subscriber(chat_id)
-                if success:
-                    return CallToolResult(
-                        content=[TextContent(type="text", text=f"Successfully subscribed chat {chat_id} to Telegram notifications")]
-                    )
-                else:
-                    return CallToolResult(
-                        content=[TextContent(type="text", text=f"Chat {chat_id} is already subscribed")],
-                        isError=True
-                    )
+            # 그룹 채팅 ID는 음수이므로 0과 정수가 아닌 값만 거름
+            if isinstance(chat_id, bool) or not isinstance(chat_id, int) or chat_id == 0:
+                return _text_result(f"Invalid chat ID: {chat_id}", is_error=True)
+            
+            success = await self._telegram.add_subscriber(chat_id)
+            if success:
+                return _text_result(f"Successfully subscribed chat {chat_id} to Telegram notifications")
             else:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="Telegram functionality is not available")],
-                    isError=True
-                )
+                return _text_result(f"Chat {chat_id} is already subscribed", is_error=True)
                 
         except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to subscribe to Telegram: {str(e)}")],
-                isError=True
-            )
+            return _text_result(f"Failed to subscribe to Telegram: {str(e)}", is_error=True)
     
     async def subscribe_email(self, arguments: Dict[str, Any]) -> CallToolResult:
         """이메일 구독"""
         try:
             email = arguments["email"]
             
+            # 형식이 잘못된 주소는 수신자 목록 저장 전에 바로 거절
+            if not isinstance(email, str) or not _EMAIL_RE.match(email):
+                return _text_result(f"Invalid email: {email}", is_error=True)
+            
             success = await mail_sender_agent.add_recipient(email)
             if success:
-                return CallToolResult(
-                    content=[TextContent(type="text", text=f"Successfully subscribed {email} to email notifications")]
-                )
+                return _text_result(f"Successfully subscribed {email} to email notifications")
             else:
-                return CallToolResult(
-                    content=[TextContent(type="text", text=f"Email {email} is already subscribed")],
-                    isError=True
-                )
+                return _text_result(f"Email {email} is already subscribed", is_error=True)
                 
         except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to subscribe to email: {str(e)}")],
-                isError=True
-            )
+            return _text_result(f"Failed to subscribe to email: {str(e)}", is_error=True)
     
     async def configure_news_sources(self, arguments: Dict[str, Any]) -> CallToolResult:
         """뉴스 소스 설정"""
@@ -372,151 +447,151 @@ class NewsAlertMCPServer:
             self.settings.enable_domestic_news = enable_domestic
             self.settings.enable_international_news = enable_international
             
-            return CallToolResult(
-                content=[TextContent(
-                    type="text",
-                    text=f"News sources configured:\n- Domestic news: {enable_domestic}\n- International news: {enable_international}"
-                )]
-            )
+            return _text_result(f"News sources configured:\n- Domestic news: {enable_domestic}\n- International news: {enable_international}")
             
         except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to configure news sources: {str(e)}")],
-                isError=True
-            )
+            return _text_result(f"Failed to configure news sources: {str(e)}", is_error=True)
     
     async def get_agent_status(self, arguments: Dict[str, Any]) -> CallToolResult:
         """에이전트 상태 조회"""
         try:
-            agents_status = []
-            
             # 각 에이전트 상태 확인
-            agents = [
-                ("collector", collector_agent),
-                ("translator", translator_agent),
-                ("analyzer", analyzer_agent),
-                ("categorizer", categorizer_agent),
-                ("telegram-sender", telegram_sender_agent),
-                ("mail-sender", mail_sender_agent)
-            ]
+            status_text = "Agent Status:\n" + "\n".join(
+                f"- {name}: {'running' if agent.running else 'stopped'}"
+                for name, agent in self._status_probes
+            )
             
-            for name, agent in agents:
-                if agent:
-                    status = "running" if agent.running else "stopped"
-                    agents_status.append(f"- {name}: {status}")
+            return _text_result(status_text)
             
-            status_text = "Agent Status:\n" + "\n".join(agents_status)
+        except Exception as e:
+            return _text_result(f"Failed to get agent status: {str(e)}", is_error=True)
+    
+    async def _test_telegram(self) -> str:
+        """텔레그램 테스트 메시지 전송 (결과 한 줄 반환)"""
+        try:
+            # 텔레그램 테스트 메시지 전송
+            test_message = "🧪 AI 뉴스 알림 테스트\n\n이것은 테스트 메시지입니다. 서비스가 정상적으로 동작하고 있습니다."
             
-            return CallToolResult(
-                content=[TextContent(type="text", text=status_text)]
-            )
+            # 테스트를 위해 모든 구독자에게 전송
+            sent_count = await self._telegram.send_to_subscribers(test_message)
+            return f"Telegram: Sent to {sent_count} subscribers"
             
         except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to get agent status: {str(e)}")],
-                isError=True
-            )
+            return f"Telegram: Failed - {str(e)}"
+    
+    async def _test_email(self) -> str:
+        """이메일 테스트 전송 (결과 한 줄 반환)"""
+        try:
+            success = await mail_sender_agent.send_test_email()
+            return f"Email: {'Sent successfully' if success else 'Failed'}"
+            
+        except Exception as e:
+            return f"Email: Failed - {str(e)}"
     
     async def send_test_notification(self, arguments: Dict[str, Any]) -> CallToolResult:
         """테스트 알림 전송"""
         try:
             channel = arguments.get("channel", "all")
             
-            results = []
-            
-            if channel in ["telegram", "all"] and telegram_sender_agent:
-                try:
-                    # 텔레그램 테스트 메시지 전송
-                    test_message = "🧪 AI 뉴스 알림 테스트\n\n이것은 테스트 메시지입니다. 서비스가 정상적으로 동작하고 있습니다."
-                    
-                    # 테스트를 위해 모든 구독자에게 전송
-                    sent_count = await telegram_sender_agent.send_to_subscribers(test_message)
-                    results.append(f"Telegram: Sent to {sent_count} subscribers")
-                    
-                except Exception as e:
-                    results.append(f"Telegram: Failed - {str(e)}")
-            
+            # 채널별 테스트를 동시에 실행 (결과 순서는 텔레그램, 이메일 순으로 유지)
+            checks = []
+            if channel in ["telegram", "all"] and self._telegram:
+                checks.append(self._test_telegram())
             if channel in ["email", "all"]:
-                try:
-                    # 이메일 테스트 전송
-                    success = await mail_sender_agent.send_test_email()
-                    results.append(f"Email: {'Sent successfully' if success else 'Failed'}")
-                    
-                except Exception as e:
-                    results.append(f"Email: Failed - {str(e)}")
+                checks.append(self._test_email())
+            
+            results = list(await asyncio.gather(*checks))
             
             if not results:
                 results.append("No channels configured for testing")
             
-            return CallToolResult(
-                content=[TextContent(
-                    type="text",
-                    text="Test Notification Results:\n" + "\n".join(results)
-                )]
-            )
+            return _text_result("Test Notification Results:\n" + "\n".join(results))
             
         except Exception as e:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Failed to send test notification: {str(e)}")],
-                isError=True
-            )
+            return _text_result(f"Failed to send test notification: {str(e)}", is_error=True)
+
+
+def configure_logging(level: str) -> logging.handlers.QueueListener:
+    """로그를 큐에 넣고 별도 스레드에서 stderr로 출력 (stdout은 MCP stdio 전송에 사용)"""
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    # 큐 쪽에서는 메시지만 확정하고, 시각·레벨 등은 출력 스레드의 포매터가 붙임
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=level.upper(), handlers=[queue_handler], force=True)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
 
 
 async def main():
+    log_listener = None
     try:
         # 설정 로드
-        settings = NewsMCPSettings(
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
-            collection_interval=int(os.getenv("COLLECTION_INTERVAL", "300")),
-            enable_domestic_news=os.getenv("ENABLE_DOMESTIC_NEWS", "true").lower() == "true",
-            enable_international_news=os.getenv("ENABLE_INTERNATIONAL_NEWS", "true").lower() == "true",
-            enable_translation=os.getenv("ENABLE_TRANSLATION", "true").lower() == "true",
-            translation_provider=os.getenv("TRANSLATION_PROVIDER", "google"),
-            enable_analysis=os.getenv("ENABLE_ANALYSIS", "true").lower() == "true",
-            analysis_model=os.getenv("ANALYSIS_MODEL", "simple"),
-            enable_telegram=os.getenv("ENABLE_TELEGRAM", "true").lower() == "true",
-            enable_email=os.getenv("ENABLE_EMAIL", "true").lower() == "true",
-            telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN", ""),
-            allowed_chat_ids=os.getenv("ALLOWED_CHAT_IDS", ""),
-            smtp_server=os.getenv("SMTP_SERVER", "smtp.gmail.com"),
-            smtp_port=int(os.getenv("SMTP_PORT", "587")),
-            smtp_username=os.getenv("SMTP_USERNAME", ""),
-            smtp_password=os.getenv("SMTP_PASSWORD", ""),
-            google_translate_api_key=os.getenv("GOOGLE_TRANSLATE_API_KEY", ""),
-            openai_api_key=os.getenv("OPENAI_API_KEY", ""),
-            papago_client_id=os.getenv("PAPAGO_CLIENT_ID", ""),
-            papago_client_secret=os.getenv("PAPAGO_CLIENT_SECRET", "")
-        )
+        settings = NewsMCPSettings.from_env()
+        log_listener = configure_logging(settings.log_level)
         
         # 필수 설정 확인
         if settings.enable_telegram and not settings.telegram_bot_token:
-            print("Warning: Telegram enabled but no bot token provided", file=sys.stderr)
+            logger.warning("Telegram enabled but no bot token provided")
         
         if settings.enable_email and not (settings.smtp_username and settings.smtp_password):
-            print("Warning: Email enabled but no SMTP credentials provided", file=sys.stderr)
+            logger.warning("Email enabled but no SMTP credentials provided")
         
         # MCP 서버 생성
         mcp_server = NewsAlertMCPServer(settings)
         
+        # SIGTERM을 받으면 메인 태스크를 취소해 아래 finally에서 에이전트를 정리
+        main_task = asyncio.current_task()
+        terminated = False
+        
+        def handle_sigterm():
+            nonlocal terminated
+            terminated = True
+            main_task.cancel()
+        
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, handle_sigterm)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows 등 시그널 핸들러를 지원하지 않는 환경
+        
         # MCP 서버 실행
-        async with stdio_server() as (read_stream, write_stream):
-            await mcp_server.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="news-alert-mcp-server",
-                    server_version="1.0.0",
-                    capabilities=mcp_server.server.get_capabilities(
-                        notification_options=None,
-                        experimental_capabilities=None
+        try:
+            try:
+                async with stdio_server() as (read_stream, write_stream):
+                    await mcp_server.server.run(
+                        read_stream,
+                        write_stream,
+                        InitializationOptions(
+                            server_name="news-alert-mcp-server",
+                            server_version="1.0.0",
+                            capabilities=mcp_server.server.get_capabilities(
+                                notification_options=None,
+                                experimental_capabilities=None
+                            )
+                        )
                     )
-                )
-            )
+            finally:
+                await mcp_server.shutdown()
+        except asyncio.CancelledError:
+            # SIGTERM으로 인한 취소는 정리가 끝났으므로 정상 종료로 처리
+            if not terminated:
+                raise
+            logger.info("Received SIGTERM, server stopped")
     
     except Exception as e:
-        print(f"Server error: {e}", file=sys.stderr)
+        logger.exception(f"Server error: {e}")
         sys.exit(1)
+    
+    finally:
+        if log_listener is not None:
+            log_listener.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop이 설치되어 있으면 libuv 기반 이벤트 루프로 실행
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
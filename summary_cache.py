@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import operator
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryCache:
+    """LLM 요약 결과 캐시
+
+    (제목, 내용, 모델) 해시로 정확히 일치하는 요청을 찾고, 임베딩 코사인 유사도로
+    거의 같은 기사(중복 보도 등)를 찾아 외부 API 호출을 건너뛴다.
+    path를 주면 정확 일치 항목을 SQLite 파일에도 저장해 재시작 후에도 재사용한다.
+    디스크 읽기·쓰기는 이벤트 루프를 막지 않도록 작업 스레드에서 실행한다.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 86400,
+                 semantic_threshold: float = 0.92, semantic_maxsize: int = 256,
+                 path: Optional[str] = None, disk_ttl: float = 7 * 86400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        self.disk_ttl = disk_ttl
+
+        # key -> (만료 시각, 요약)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # (만료 시각, 정규화된 임베딩, 요약)
+        self._embeddings: Deque[Tuple[float, List[float], str]] = deque(maxlen=semantic_maxsize)
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        # 디스크 저장소 (최초 사용 시 연결, 만료 시각은 재시작 후에도 유효하도록 벽시계 기준)
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        # 연결은 작업 스레드들이 공유하므로 한 번에 하나씩만 사용
+        self._db_lock = threading.Lock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and self.path:
+            self._db = self._open_db(self.path)
+            if self._db is None:
+                self.path = None
+        return self._db
+
+    @staticmethod
+    def _open_db(path: str) -> Optional[sqlite3.Connection]:
+        try:
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, summary TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute("DELETE FROM summaries WHERE expires_at < ?", (time.time(),))
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache persistence disabled ({path}): {e}")
+            return None
+
+    @staticmethod
+    def make_key(title: str, content: str, model: str) -> str:
+        """캐시 키 생성"""
+        payload = json.dumps(
+            {"title": title, "content": content[:2000], "model": model},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """정확 일치 조회 (메모리 → 디스크 순)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, summary = entry
+            if expires_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return summary
+            del self._entries[key]
+
+        summary = await asyncio.to_thread(self._load, key) if self.path else None
+        if summary is None:
+            self.misses += 1
+            return None
+
+        self._remember(key, summary)
+        self.hits += 1
+        return summary
+
+    async def set(self, key: str, summary: str):
+        """정확 일치 항목 저장"""
+        self._remember(key, summary)
+        if self.path:
+            await asyncio.to_thread(self._store, key, summary)
+
+    def _remember(self, key: str, summary: str):
+        self._entries[key] = (time.monotonic() + self.ttl, summary)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[str]:
+        with self._db_lock:
+            db = self._connection()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT summary FROM summaries WHERE key = ? AND expires_at >= ?",
+                    (key, time.time())
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Summary cache read failed: {e}")
+                return None
+            return row[0] if row else None
+
+    def _store(self, key: str, summary: str):
+        with self._db_lock:
+            db = self._connection()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, summary, expires_at) VALUES (?, ?, ?)",
+                    (key, summary, time.time() + self.disk_ttl)
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Summary cache write failed: {e}")
+
+    def close(self):
+        """디스크 저장소 닫기 (이후 항목은 메모리에만 저장)"""
+        with self._db_lock:
+            self.path = None
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get_similar(self, embedding: Sequence[float]) -> Optional[str]:
+        """임베딩 유사도 기반 조회"""
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        now = time.monotonic()
+        best_score = self.semantic_threshold
+        best_summary = None
+
+        for expires_at, vector, summary in self._embeddings:
+            if expires_at < now:
+                continue
+            score = sum(map(operator.mul, query, vector))
+            if score >= best_score:
+                best_score = score
+                best_summary = summary
+
+        if best_summary is not None:
+            self.semantic_hits += 1
+        return best_summary
+
+    def add_embedding(self, embedding: Sequence[float], summary: str):
+        """유사도 검색용 임베딩 저장"""
+        vector = self._normalize(embedding)
+        if vector is not None:
+            self._embeddings.append((time.monotonic() + self.ttl, vector, summary))
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[List[float]]:
+        # 미리 정규화해 두면 코사인 유사도가 내적 한 번으로 끝난다
+        norm = math.sqrt(sum(x * x for x in embedding))
+        if not norm:
+            return None
+        return [x / norm for x in embedding]
+
+    def __len__(self) -> int:
+        return len(self._entries)
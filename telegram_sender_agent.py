@@ -1,8 +1,11 @@
 import asyncio
+import aiohttp
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional, Sequence, Tuple
 import logging
 import os
+import tempfile
+import time
 
 from agent_base import BaseAgent, AgentMessage, CategorizedNews, TranslatedNews, NewsItem, message_broker
 
@@ -15,6 +18,56 @@ except ImportError:
     TELEGRAM_AVAILABLE = False
     print("Warning: python-telegram-bot not installed. Telegram functionality will be disabled.")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from aiolimiter import AsyncLimiter
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
+
+
+# 뉴스 메시지의 고정 문구 (앞뒤 빈 줄 포함)
+_HEADER = "🤖 *AI 뉴스 알림*\n"
+_SUMMARY_LABEL = "\n📋 *요약*:"
+_KEY_POINTS_LABEL = "\n🔑 *주요 포인트*:"
+_FOOTER = "\n📤 구독 해지: /unsubscribe"
+
+# 트렌드 레벨 이모지
+_TREND_EMOJI = {
+    "high": "🔥",
+    "medium": "📈",
+    "low": "📉"
+}
+_DEFAULT_TREND_EMOJI = "📊"
+
+# 기사 제목·요약 등 외부 텍스트의 Markdown(legacy) 특수문자 이스케이프 (엔티티 파싱 오류 방지)
+_MARKDOWN_ESCAPE = str.maketrans({char: "\\" + char for char in "_*`["})
+
+# Bot API 직접 호출 (sendMessage 본문은 미리 인코딩해 두고 chat_id만 앞에 붙임)
+_BOT_API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _describe_error(error: BaseException) -> str:
+    """로그용 오류 설명 (aiohttp 오류 문자열에는 봇 토큰이 든 요청 URL이 포함되므로 종류와 상태만 사용)"""
+    status = getattr(error, "status", None)
+    if status is not None:
+        return f"{type(error).__name__} (HTTP {status})"
+    return type(error).__name__
+
+
+class _SendInterrupted(Exception):
+    """일시적인 오류로 한 채팅에 대한 전송이 중단됨 (sent_parts개 조각까지는 전송됨)"""
+    
+    def __init__(self, sent_parts: int, reason: Any):
+        super().__init__(reason)
+        self.sent_parts = sent_parts
+
 
 class TelegramSenderAgent(BaseAgent):
     """텔레그램 뉴스 발신 에이전트"""
@@ -24,18 +77,43 @@ class TelegramSenderAgent(BaseAgent):
         
         # 텔레그램 설정
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-        self.allowed_chat_ids = self.parse_chat_ids(os.getenv("ALLOWED_CHAT_IDS", ""))
+        self.allowed_chat_ids: FrozenSet[int] = self.parse_chat_ids(os.getenv("ALLOWED_CHAT_IDS", ""))
         
         # 텔레그램 봇 인스턴스
         self.bot = None
         self.application = None
+        # 브로커 메시지 처리 태스크 (봇 폴링과 분리해 실행)
+        self._broker_task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
         
         # 전송 설정
         self.max_message_length = 4096  # 텔레그램 메시지 제한
         self.enable_markdown = True
         
+        # 동시 전송 수(구독자 샤드 수)와 초당 전송 수 (텔레그램 봇 전체 제한: 초당 30건)
+        self.max_concurrent_sends = 30
+        self.send_rate = 30
+        # 429(retry_after) 응답을 받은 채팅에 다시 보내는 횟수
+        self.max_send_retries = 1
+        # 네트워크 오류 등 일시적인 실패는 전송 라운드를 다시 돌려 재시도 (지수 백오프)
+        self.max_send_attempts = 3
+        self.send_retry_backoff = 1.0
+        # 같은 토큰으로 보내는 구독자 전송과 명령 응답이 함께 쓰는 단일 제한기
+        self._limiter = AsyncLimiter(self.send_rate, 1) if AIOLIMITER_AVAILABLE else None
+        self._next_send_at = 0.0
+        
+        # 구독자 전송용 HTTP 세션 (최초 전송 시 생성)
+        self._send_url = _BOT_API_URL.format(token=self.bot_token)
+        self._http: Optional[aiohttp.ClientSession] = None
+        
         # 구독자 관리
         self.subscribers = set()  # 메모리에 저장 (실제로는 DB에 저장)
+        self.subscribers_file = "subscribers.json"
+        # 변경 후 save_delay초 동안의 추가 변경은 한 번의 저장으로 묶음
+        self.save_delay = 2.0
+        self._subscribers_dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_now = asyncio.Event()
         self.load_subscribers()
         
         # 통계
@@ -45,12 +123,12 @@ class TelegramSenderAgent(BaseAgent):
         if TELEGRAM_AVAILABLE and self.bot_token:
             self.initialize_telegram()
     
-    def parse_chat_ids(self, chat_ids_str: str) -> List[int]:
-        """채팅 ID 파싱"""
+    def parse_chat_ids(self, chat_ids_str: str) -> FrozenSet[int]:
+        """채팅 ID 파싱 (명령 처리 때마다 조회하므로 frozenset으로 보관)"""
         try:
-            return [int(x.strip()) for x in chat_ids_str.split(",") if x.strip()]
+            return frozenset(int(x.strip()) for x in chat_ids_str.split(",") if x.strip())
         except:
-            return []
+            return frozenset()
     
     def load_subscribers(self):
         """구독자 목록 로드"""
@@ -107,29 +185,50 @@ class TelegramSenderAgent(BaseAgent):
             
             self.logger.info("Telegram bot started polling")
             
-            # 메시지 처리 루프
-            while self.running:
-                try:
-                    # 메시지 처리
-                    message = await self.receive_message()
-                    if message:
-                        await self.process_message(message)
-                    
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error in telegram sender agent: {e}")
-                    await asyncio.sleep(5)
+            # 봇 폴링은 PTB 태스크가 처리하고, 브로커 메시지는 별도 태스크에서 처리
+            self._broker_task = asyncio.create_task(self._broker_loop(), name=f"{self.name}:broker")
+            await self._stop_event.wait()
         
         except Exception as e:
             self.logger.error(f"Failed to start Telegram bot: {e}")
     
+    async def _broker_loop(self):
+        """다른 에이전트가 보낸 메시지 처리 루프"""
+        while self.running:
+            try:
+                # 메시지 처리
+                message = await self.receive_message()
+                if message:
+                    await self.process_message(message)
+                
+            except Exception as e:
+                self.logger.error(f"Error in telegram sender agent: {e}")
+                await asyncio.sleep(5)
+    
     async def stop(self):
         """에이전트 중지"""
         await super().stop()
+        self._stop_event.set()
+        
+        # 처리 중인 메시지는 마저 처리
+        if self._broker_task is not None:
+            await self._broker_task
+            self._broker_task = None
+        
+        # 대기 중인 구독자 저장은 바로 실행
+        if self._save_task is not None and not self._save_task.done():
+            self._save_now.set()
+            await self._save_task
+        
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
         
         if self.application:
             try:
+                # 폴링 중인 Updater는 Application보다 먼저 멈춰야 shutdown이 가능
+                if self.application.updater and self.application.updater.running:
+                    await self.application.updater.stop()
                 await self.application.stop()
                 await self.application.shutdown()
                 self.logger.info("Telegram bot stopped")
@@ -150,8 +249,8 @@ class TelegramSenderAgent(BaseAgent):
     async def send_news_message(self, message: AgentMessage):
         """뉴스 메시지 전송"""
         try:
-            categorized_news_data = message.data["categorized_news"]
-            categorized_news = CategorizedNews(**categorized_news_data)
+            # 모델 객체는 재검증 없이 그대로, dict는 검증 후 변환
+            categorized_news = CategorizedNews.model_validate(message.data["categorized_news"])
             
             # 포맷팅된 메시지 생성
             formatted_message = self.format_news_message(categorized_news)
@@ -160,7 +259,7 @@ class TelegramSenderAgent(BaseAgent):
             sent_count = await self.send_to_subscribers(formatted_message)
             
             self.send_count += sent_count
-            self.logger.info(f"Sent news to {sent_count} subscribers")
+            self.logger.info("Sent news to %d subscribers", sent_count)
             
         except Exception as e:
             self.error_count += 1
@@ -177,51 +276,49 @@ class TelegramSenderAgent(BaseAgent):
         else:
             title = news.title
         
-        # 요약
+        trend_level = categorized_news.trend_level
         summary = analyzed_news.summary
-        
-        # 메시지 구성
+        category = categorized_news.category
+        key_points = analyzed_news.key_points[:3]
+        tags = categorized_news.tags[:5]
+        
+        if self.enable_markdown:
+            title = title.translate(_MARKDOWN_ESCAPE)
+            summary = summary.translate(_MARKDOWN_ESCAPE)
+            category = category.translate(_MARKDOWN_ESCAPE)
+            key_points = [point.translate(_MARKDOWN_ESCAPE) for point in key_points]
+            tags = [tag.translate(_MARKDOWN_ESCAPE) for tag in tags]
+        
+        # 메시지 구성 (고정 문구는 모듈 상수, 값이 들어가는 줄만 포맷팅)
         message_parts = [
-            f"🤖 *AI 뉴스 알림*",
-            f"",
+            _HEADER,
             f"📰 *제목*: {title}",
-            f"🏷️ 카테고리: {categorized_news.category}",
-            f"📈 트렌드 레벨: {self.get_trend_emoji(categorized_news.trend_level)} {categorized_news.trend_level.upper()}",
-            f"",
-            f"📋 *요약*:",
-            f"{summary}",
+            f"🏷️ 카테고리: {category}",
+            f"📈 트렌드 레벨: {_TREND_EMOJI.get(trend_level, _DEFAULT_TREND_EMOJI)} {trend_level.upper()}",
+            _SUMMARY_LABEL,
+            summary,
         ]
         
         # 키 포인트 추가
-        if analyzed_news.key_points:
-            message_parts.append("")
-            message_parts.append("🔑 *주요 포인트*:")
-            for i, point in enumerate(analyzed_news.key_points[:3], 1):
+        if key_points:
+            message_parts.append(_KEY_POINTS_LABEL)
+            for i, point in enumerate(key_points, 1):
                 message_parts.append(f"{i}. {point}")
         
         # 태그 추가
-        if categorized_news.tags:
-            message_parts.append("")
-            message_parts.append(f"🏷️ 태그: {', '.join(categorized_news.tags[:5])}")
+        if tags:
+            message_parts.append(f"\n🏷️ 태그: {', '.join(tags)}")
         
         # 링크 추가
-        message_parts.append("")
-        message_parts.append(f"🔗 [원문 기사]({news.url})")
-        message_parts.append("")
+        message_parts.append(f"\n🔗 [원문 기사]({news.url})\n")
         message_parts.append(f"📊 중요도: {analyzed_news.importance_score:.2f} | AI 관련성: {analyzed_news.ai_relevance:.2f}")
-        message_parts.append("")
-        message_parts.append("📤 구독 해지: /unsubscribe")
+        message_parts.append(_FOOTER)
         
         return "\n".join(message_parts)
     
     def get_trend_emoji(self, trend_level: str) -> str:
         """트렌드 레벨 이모지"""
-        emoji_map = {
-            "high": "🔥",
-            "medium": "📈", 
-            "low": "📉"
-        }
-        return emoji_map.get(trend_level, "📊")
+        return _TREND_EMOJI.get(trend_level, _DEFAULT_TREND_EMOJI)
     
     async def send_to_subscribers(self, message: str) -> int:
         """구독자에게 메시지 전송"""
@@ -229,37 +326,143 @@ class TelegramSenderAgent(BaseAgent):
             self.logger.error("Telegram bot not initialized")
             return 0
         
-        sent_count = 0
+        # 모든 구독자에게 같은 내용이므로 분할과 JSON 인코딩은 한 번만 수행
+        if len(message) > self.max_message_length:
+            payloads = self.split_message(message)
+        else:
+            payloads = (message,)
+        parse_mode = "Markdown" if self.enable_markdown else None
+        bodies = [self._encode_message(text, parse_mode) for text in payloads]
         
-        for chat_id in self.subscribers:
+        # 일시적으로 실패한 구독자는 전송하지 못한 조각부터 다음 라운드에서 다시 전송
+        pending = [(chat_id, 0) for chat_id in self.subscribers]
+        sent_count = 0
+        for attempt in range(self.max_send_attempts):
+            if attempt:
+                self.logger.warning("Retrying %d subscribers after transient send failures", len(pending))
+                await asyncio.sleep(self.send_retry_backoff * 2 ** (attempt - 1))
+            sent, pending = await self._send_round(pending, bodies)
+            sent_count += sent
+            if not pending:
+                break
+        
+        for chat_id, _ in pending:
+            self.logger.error("Failed to send to %s after %d attempts", chat_id, self.max_send_attempts)
+        return sent_count
+    
+    async def _send_round(self, items: List[Tuple[int, int]], bodies: Sequence[bytes]) -> Tuple[int, List[Tuple[int, int]]]:
+        """(chat_id, 시작 조각) 목록에 한 번 전송 (성공 건수와 재시도할 목록 반환)"""
+        # 구독자를 chat_id 기준으로 나눠 샤드마다 순서대로 전송하고, 샤드끼리는 동시에 진행
+        # (초당 전송 수는 모든 샤드가 같은 제한기를 공유해 맞춤)
+        shard_count = min(self.max_concurrent_sends, len(items))
+        if not shard_count:
+            return 0, []
+        shards = [[] for _ in range(shard_count)]
+        for item in items:
+            shards[item[0] % shard_count].append(item)
+        
+        results = await asyncio.gather(*(self._send_shard(shard, bodies) for shard in shards))
+        sent_count = 0
+        requeued = []
+        for sent, retry in results:
+            sent_count += sent
+            requeued.extend(retry)
+        return sent_count, requeued
+    
+    async def _send_shard(self, items: List[Tuple[int, int]], bodies: Sequence[bytes]) -> Tuple[int, List[Tuple[int, int]]]:
+        """샤드 하나의 구독자에게 차례로 전송 (성공 건수와 재시도할 목록 반환)"""
+        sent_count = 0
+        requeued = []
+        for chat_id, start in items:
             try:
-                # 메시지 길이 확인 및 분할
-                if len(message) > self.max_message_length:
-                    messages = self.split_message(message)
-                    for msg in messages:
-                        await self.bot.send_message(
-                            chat_id=chat_id,
-                            text=msg,
-                            parse_mode="Markdown" if self.enable_markdown else None,
-                            disable_web_page_preview=False
-                        )
-                else:
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=message,
-                        parse_mode="Markdown" if self.enable_markdown else None,
-                        disable_web_page_preview=False
-                    )
-                
-                sent_count += 1
-                
-                # 전송 간격 (Rate limiting)
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Failed to send to {chat_id}: {e}")
+                if await self._send_one(chat_id, bodies, start):
+                    sent_count += 1
+            except _SendInterrupted as e:
+                self.logger.debug("Send to %s interrupted: %s", chat_id, e)
+                requeued.append((chat_id, e.sent_parts))
+        return sent_count, requeued
+    
+    @staticmethod
+    def _encode_message(text: str, parse_mode: Optional[str]) -> bytes:
+        """chat_id를 뺀 sendMessage 요청 본문 인코딩"""
+        payload = {"text": text}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=False).encode()
+    
+    async def _ensure_http(self) -> aiohttp.ClientSession:
+        """구독자 전송용 HTTP 세션 반환"""
+        if self._http is None or self._http.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrent_sends,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._http = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._http
+    
+    async def _send_one(self, chat_id: int, bodies: Sequence[bytes], start: int = 0) -> bool:
+        """한 구독자에게 start번째 조각부터 전송 (성공 여부 반환, 일시적인 실패는 _SendInterrupted)"""
+        try:
+            session = await self._ensure_http()
+            for index in range(start, len(bodies)):
+                # 미리 인코딩한 본문의 여는 중괄호 자리에 chat_id 필드를 끼워 넣음
+                data = b'{"chat_id":%d,' % chat_id + bodies[index][1:]
+                retries = 0
+                while True:
+                    await self._throttle()
+                    try:
+                        async with session.post(self._send_url, data=data, headers=_JSON_HEADERS) as response:
+                            result = await response.json()
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        raise _SendInterrupted(index, _describe_error(e))
+                    if result.get("ok"):
+                        break
+                    
+                    # 전송 한도 초과(429)는 이 샤드만 retry_after초 쉬고 같은 채팅에 다시 전송
+                    error_code = result.get("error_code") or 0
+                    description = result.get("description")
+                    retry_after = result.get("parameters", {}).get("retry_after")
+                    if retry_after and retries < self.max_send_retries:
+                        retries += 1
+                        await asyncio.sleep(retry_after)
+                        continue
+                    
+                    if error_code == 403:
+                        # 봇을 차단했거나 나간 채팅은 구독자 목록에서 정리
+                        self.logger.warning("Chat %s is unreachable, unsubscribing: %s", chat_id, description)
+                        await self.remove_subscriber(chat_id)
+                        return False
+                    if retry_after or error_code >= 500:
+                        raise _SendInterrupted(index, description)
+                    
+                    self.logger.error("Failed to send to %s: %s", chat_id, description)
+                    return False
+            return True
+            
+        except _SendInterrupted:
+            raise
+        except Exception as e:
+            self.logger.error("Failed to send to %s: %s", chat_id, _describe_error(e))
+            return False
+    
+    async def _throttle(self):
+        """초당 send_rate건을 넘지 않도록 대기"""
+        if self._limiter is not None:
+            await self._limiter.acquire()
+            return
         
-        return sent_count
+        # aiolimiter가 없으면 전송 시각을 1/send_rate초 간격으로 배정
+        now = time.monotonic()
+        slot = max(self._next_send_at, now)
+        self._next_send_at = slot + 1 / self.send_rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
     
     def split_message(self, message: str) -> List[str]:
         """긴 메시지 분할"""
@@ -267,31 +470,45 @@ class TelegramSenderAgent(BaseAgent):
             return [message]
         
         # 단순 분할 (더 정교한 분할 가능)
+        # 줄 목록과 길이 합계만 유지하고 내보낼 때 한 번 join (문자열 += 반복 복사 방지)
         messages = []
-        current_message = ""
-        
-        lines = message.split('\n')
-        for line in lines:
-            if len(current_message + line + '\n') > self.max_message_length:
-                if current_message:
-                    messages.append(current_message.rstrip())
-                current_message = line + '\n'
+        max_length = self.max_message_length
+        current_lines: List[str] = []
+        current_length = 0  # 줄마다 개행 1자 포함
+        
+        for line in message.split('\n'):
+            line_length = len(line) + 1
+            if current_length + line_length > max_length:
+                if current_lines:
+                    messages.append('\n'.join(current_lines).rstrip())
+                current_lines = [line]
+                current_length = line_length
             else:
-                current_message += line + '\n'
+                current_lines.append(line)
+                current_length += line_length
         
-        if current_message:
-            messages.append(current_message.rstrip())
+        if current_lines:
+            messages.append('\n'.join(current_lines).rstrip())
         
         return messages
     
     # 텔레그램 핸들러들
+    def _reply(self, update: Update, context: ContextTypes.DEFAULT_TYPE, text: str, **kwargs):
+        """응답 전송을 예약하고 바로 반환 (핸들러가 전송 완료를 기다리지 않음)"""
+        context.application.create_task(self._send_reply(update, text, **kwargs), update=update)
+    
+    async def _send_reply(self, update: Update, text: str, **kwargs):
+        """구독자 전송과 같은 제한기를 거쳐 응답 전송"""
+        await self._throttle()
+        await update.message.reply_text(text, **kwargs)
+    
     async def handle_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """/start 핸들러"""
         chat_id = update.effective_chat.id
         
         if self.is_allowed_chat(chat_id):
             await self.add_subscriber(chat_id)
-            await update.message.reply_text(
+            self._reply(update, context,
                 "🤖 AI 뉴스 알림 봇에 오신 것을 환영합니다!\n"
                 "이제부터 AI 트렌드 뉴스를 받으실 수 있습니다.\n\n"
                 "📋 명령어:\n"
@@ -301,7 +518,7 @@ class TelegramSenderAgent(BaseAgent):
                 "/status - 구독 상태"
             )
         else:
-            await update.message.reply_text("⚠️ 접근 권한이 없습니다.")
+            self._reply(update, context, "⚠️ 접근 권한이 없습니다.")
     
     async def handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """/help 핸들러"""
@@ -328,7 +545,7 @@ class TelegramSenderAgent(BaseAgent):
 문제가 있으시면 관리자에게 문의하세요.
         """
         
-        await update.message.reply_text(help_text, parse_mode="Markdown")
+        self._reply(update, context, help_text, parse_mode="Markdown")
     
     async def handle_subscribe(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """/subscribe 핸들러"""
@@ -336,20 +553,20 @@ class TelegramSenderAgent(BaseAgent):
         
         if self.is_allowed_chat(chat_id):
             if await self.add_subscriber(chat_id):
-                await update.message.reply_text("✅ AI 뉴스 구독이 시작되었습니다!")
+                self._reply(update, context, "✅ AI 뉴스 구독이 시작되었습니다!")
             else:
-                await update.message.reply_text("⚠️ 이미 구독 중입니다.")
+                self._reply(update, context, "⚠️ 이미 구독 중입니다.")
         else:
-            await update.message.reply_text("⚠️ 접근 권한이 없습니다.")
+            self._reply(update, context, "⚠️ 접근 권한이 없습니다.")
     
     async def handle_unsubscribe(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """/unsubscribe 핸들러"""
         chat_id = update.effective_chat.id
         
         if await self.remove_subscriber(chat_id):
-            await update.message.reply_text("✅ AI 뉴스 구독이 해지되었습니다.")
+            self._reply(update, context, "✅ AI 뉴스 구독이 해지되었습니다.")
         else:
-            await update.message.reply_text("⚠️ 구독 중이 아닙니다.")
+            self._reply(update, context, "⚠️ 구독 중이 아닙니다.")
     
     async def handle_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """/status 핸들러"""
@@ -366,18 +583,18 @@ class TelegramSenderAgent(BaseAgent):
 ❌ 전송 실패: {self.error_count}건
         """
         
-        await update.message.reply_text(status_text, parse_mode="Markdown")
+        self._reply(update, context, status_text, parse_mode="Markdown")
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """일반 메시지 핸들러"""
         chat_id = update.effective_chat.id
         text = update.message.text
         
-        self.logger.info(f"Received message from {chat_id}: {text}")
+        self.logger.info("Received message from %s: %s", chat_id, text)
         
         # 간단한 응답
         if text.lower() in ["hi", "hello", "안녕", "안녕하세요"]:
-            await update.message.reply_text(
+            self._reply(update, context,
                 "안녕하세요! AI 뉴스 알림 봇입니다.\n"
                 "도움이 필요하시면 /help를 입력해주세요."
             )
@@ -392,7 +609,7 @@ class TelegramSenderAgent(BaseAgent):
         """구독자 추가"""
         if chat_id not in self.subscribers:
             self.subscribers.add(chat_id)
-            self.save_subscribers()
+            self._schedule_save()
             self.logger.info(f"Added subscriber: {chat_id}")
             return True
         return False
@@ -401,20 +618,55 @@ class TelegramSenderAgent(BaseAgent):
         """구독자 제거"""
         if chat_id in self.subscribers:
             self.subscribers.remove(chat_id)
-            self.save_subscribers()
+            self._schedule_save()
             self.logger.info(f"Removed subscriber: {chat_id}")
             return True
         return False
     
-    def save_subscribers(self):
-        """구독자 목록 저장"""
+    def _schedule_save(self):
+        """구독자 목록 저장 예약"""
+        self._subscribers_dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_now.clear()
+            self._save_task = asyncio.create_task(self._flush_subscribers())
+    
+    async def _flush_subscribers(self):
+        """save_delay초(또는 중지 요청까지) 기다린 뒤 변경된 구독자 목록 저장"""
+        try:
+            await asyncio.wait_for(self._save_now.wait(), timeout=self.save_delay)
+        except asyncio.TimeoutError:
+            pass
+        
+        # 저장하는 동안 생긴 변경도 이어서 저장
+        while self._subscribers_dirty:
+            self._subscribers_dirty = False
+            await self.save_subscribers()
+    
+    async def save_subscribers(self):
+        """구독자 목록 저장 (파일 쓰기는 스레드에서 실행)"""
         try:
             # 실제로는 파일이나 DB에 저장
-            with open("subscribers.json", "w") as f:
-                json.dump(list(self.subscribers), f)
+            subscribers = sorted(self.subscribers)
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(subscribers)
+            else:
+                payload = json.dumps(subscribers).encode()
+            await asyncio.to_thread(self._write_subscribers, payload)
         except Exception as e:
             self.logger.error(f"Error saving subscribers: {e}")
     
+    def _write_subscribers(self, payload: bytes):
+        # 임시 파일에 쓴 뒤 교체해 저장 중 중단되어도 기존 목록이 깨지지 않도록 함
+        directory = os.path.dirname(os.path.abspath(self.subscribers_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.subscribers_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
     async def send_subscribers_info(self, requester: str):
         """구독자 정보 전송"""
         await self.send_message(requester, "subscribers_info", {
@@ -428,6 +680,6 @@ class TelegramSenderAgent(BaseAgent):
 # TelegramSenderAgent 인스턴스 생성 및 등록
 if TELEGRAM_AVAILABLE:
     telegram_sender_agent = TelegramSenderAgent()
-    message_broker.register_agent(telegram_sender_agent)
+    message_broker.register_agent(telegram_sender_agent, single_consumer=True)
 else:
     telegram_sender_agent = None
\ No newline at end of file
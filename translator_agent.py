@@ -1,12 +1,18 @@
 import asyncio
 import aiohttp
+import contextlib
+import hashlib
 import json
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 import os
 
 from agent_base import BaseAgent, AgentMessage, NewsItem, TranslatedNews, message_broker
 
+# 일시적인 API 오류로 받은 대체 문자열은 캐시하지 않음
+_ERROR_PREFIXES = ("[Google Error] ", "[Papago Error] ")
+
 
 class TranslatorAgent(BaseAgent):
     """해외 뉴스 번역 에이전트"""
@@ -23,6 +29,24 @@ class TranslatorAgent(BaseAgent):
         # 번역 품질 임계값
         self.confidence_threshold = 0.7
         
+        # 동시에 번역할 최대 뉴스 수 (일괄 메시지도 이 수만큼만 동시에 번역 API 호출)
+        self.batch_size = 16
+        self._translate_semaphore = asyncio.Semaphore(self.batch_size)
+        
+        # 번역 API 호출용 HTTP 세션 (최초 사용 시 생성, keep-alive 연결 재사용)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # 번역 결과 캐시 (여러 소스가 같은 헤드라인을 싣는 경우 API 호출 생략)
+        self.translation_cache_size = 5000
+        self._translation_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        
+        # Google 번역 요청 묶음 처리 (짧은 시간 동안 모인 텍스트를 한 번의 POST로 전송)
+        self.google_batch_window = 0.2
+        self.google_batch_size = 100  # Google v2의 요청당 q 최대 개수(128) 이하
+        self.google_batch_max_chars = 5000  # Google v2 권장 요청당 최대 글자 수 (이보다 긴 텍스트는 단독 전송)
+        self._google_pending: Dict[Tuple[str, str], List[Tuple[str, asyncio.Future]]] = {}
+        self._google_flush_task: Optional[asyncio.Task] = None
+        
         # 지원 언어 쌍
         self.supported_languages = {
             "en": "ko",  # 영어 → 한국어
@@ -39,24 +63,64 @@ class TranslatorAgent(BaseAgent):
                 if message:
                     await self.process_message(message)
                 
-                await asyncio.sleep(1)
-                
             except Exception as e:
                 self.logger.error(f"Error in translator agent: {e}")
                 await asyncio.sleep(5)
     
+    async def stop(self):
+        """에이전트 중지"""
+        await super().stop()
+        await self.close()
+    
+    async def close(self):
+        """대기 중인 번역 묶음을 취소한 뒤 HTTP 세션 정리 (기다리던 쪽은 오류를 받음)"""
+        if self._google_flush_task is not None and not self._google_flush_task.done():
+            self._google_flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._google_flush_task
+        self._google_flush_task = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """번역 API용 HTTP 세션 반환"""
+        if self._session is None or self._session.closed:
+            # Google/Naver 두 호스트만 반복 호출하므로 연결을 오래 유지하고 DNS 결과를 캐시
+            connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
     async def process_message(self, message: AgentMessage):
         """수신된 메시지 처리"""
         if message.message_type == "translate_news":
             await self.translate_news_message(message)
+        elif message.message_type == "translate_news_batch":
+            await self.translate_news_batch_message(message)
         elif message.message_type == "get_translation_status":
             await self.send_translation_status(message.sender)
     
     async def translate_news_message(self, message: AgentMessage):
         """뉴스 번역 처리"""
+        await self.handle_news(message.data["news"], message.sender)
+    
+    async def translate_news_batch_message(self, message: AgentMessage):
+        """뉴스 일괄 번역 처리 (한 메시지로 전달된 뉴스를 batch_size개씩 동시에 번역)"""
+        await asyncio.gather(*(
+            self._handle_news_bounded(news_data, message.sender)
+            for news_data in message.data["news_items"]
+        ))
+    
+    async def _handle_news_bounded(self, news_data: Union[NewsItem, Dict[str, Any]], sender: str):
+        """동시 번역 수를 batch_size로 제한해 handle_news 실행"""
+        async with self._translate_semaphore:
+            await self.handle_news(news_data, sender)
+    
+    async def handle_news(self, news_data: Union[NewsItem, Dict[str, Any]], sender: str):
+        """뉴스 한 건 번역 후 분석기로 전달"""
         try:
-            news_data = message.data["news"]
-            news = NewsItem(**news_data)
+            # NewsItem 객체는 그대로 사용하고, dict일 때만 검증
+            news = NewsItem.model_validate(news_data)
             
             # 번역 가능 여부 확인
             if news.language not in self.supported_languages:
@@ -67,19 +131,19 @@ class TranslatorAgent(BaseAgent):
             translated_news = await self.translate_news(news)
             
             if translated_news:
-                # 번역 결과를 분석기로 전송
+                # 번역 결과를 분석기로 전송 (프로세스 내부 전달이므로 모델 객체 그대로)
                 await self.send_message("analyzer", "analyze_news", {
-                    "news": translated_news.dict()
+                    "news": translated_news
                 })
                 
                 # 원래 발신자에게 결과 통보
-                if message.sender != "collector":
-                    await self.send_message(message.sender, "translation_complete", {
+                if sender != "collector":
+                    await self.send_message(sender, "translation_complete", {
                         "original_id": news.id,
                         "translated_id": translated_news.original.id
                     })
                 
-                self.logger.info(f"Translated news: {news.title}")
+                self.logger.info("Translated news: %s", news.title)
             
         except Exception as e:
             self.logger.error(f"Error translating news: {e}")
@@ -87,17 +151,10 @@ class TranslatorAgent(BaseAgent):
     async def translate_news(self, news: NewsItem) -> Optional[TranslatedNews]:
         """뉴스 번역"""
         try:
-            # 제목 번역
-            translated_title = await self.translate_text(
-                news.title, 
-                news.language, 
-                "ko"
-            )
-            
-            # 내용 번역
-            translated_content = await self.translate_text(
-                news.content, 
-                news.language, 
+            # 제목과 내용을 함께 번역 (Google은 한 번의 요청, 그 외는 동시 요청)
+            translated_title, translated_content = await self.translate_texts(
+                [news.title, news.content],
+                news.language,
                 "ko"
             )
             
@@ -107,7 +164,8 @@ class TranslatorAgent(BaseAgent):
                 news.content, translated_content
             )
             
-            translated_news = TranslatedNews(
+            # 내부에서 계산한 값이므로 검증 없이 생성
+            translated_news = TranslatedNews.model_construct(
                 original=news,
                 translated_title=translated_title,
                 translated_content=translated_content,
@@ -122,44 +180,176 @@ class TranslatorAgent(BaseAgent):
     
     async def translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
         """텍스트 번역"""
+        translated_texts = await self.translate_texts([text], source_lang, target_lang)
+        return translated_texts[0]
+    
+    async def translate_texts(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """여러 텍스트 번역 (입력 순서대로 반환, 캐시에 없는 텍스트만 API 호출)"""
+        keys = [self._translation_key(text, source_lang, target_lang) for text in texts]
+        
+        # 대기 중 캐시에서 밀려나도 쓸 수 있도록 찾은 결과는 따로 보관
+        found: Dict[bytes, str] = {}
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            translated_text = self._translation_cache.get(key)
+            if translated_text is not None:
+                self._translation_cache.move_to_end(key)
+                found[key] = translated_text
+            else:
+                missing.setdefault(key, text)
+        
+        if missing:
+            translated_texts = await self._translate_uncached(list(missing.values()), source_lang, target_lang)
+            for key, translated_text in zip(missing, translated_texts):
+                found[key] = translated_text
+                if not translated_text.startswith(_ERROR_PREFIXES):
+                    self._remember_translation(key, translated_text)
+        
+        return [found[key] for key in keys]
+    
+    @staticmethod
+    def _translation_key(text: str, source_lang: str, target_lang: str) -> bytes:
+        """번역 캐시 키 (암호학적 용도가 아니므로 빠른 blake2b 사용)"""
+        return hashlib.blake2b(f"{source_lang}:{target_lang}:{text}".encode(), digest_size=16).digest()
+    
+    def _remember_translation(self, key: bytes, translated_text: str):
+        self._translation_cache[key] = translated_text
+        self._translation_cache.move_to_end(key)
+        if len(self._translation_cache) > self.translation_cache_size:
+            self._translation_cache.popitem(last=False)
+    
+    async def _translate_uncached(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """번역 제공자 호출"""
         if self.translation_provider == "google":
-            return await self.translate_with_google(text, source_lang, target_lang)
+            if not self.google_api_key:
+                return await self.translate_many_with_google(texts, source_lang, target_lang)
+            return await self._queue_google_translation(texts, source_lang, target_lang)
         elif self.translation_provider == "papago":
-            return await self.translate_with_papago(text, source_lang, target_lang)
+            return list(await asyncio.gather(*(
+                self.translate_with_papago(text, source_lang, target_lang) for text in texts
+            )))
         else:
             # 기본 번역 (모의)
-            return f"[{source_lang}->{target_lang}] {text}"
+            return [f"[{source_lang}->{target_lang}] {text}" for text in texts]
+    
+    async def _queue_google_translation(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """번역할 텍스트를 Google 요청 묶음에 넣고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        pending = self._google_pending.setdefault((source_lang, target_lang), [])
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            pending.append((text, future))
+            futures.append(future)
+        
+        if self._google_flush_task is None or self._google_flush_task.done():
+            self._google_flush_task = asyncio.create_task(self._flush_google_batches())
+        
+        return list(await asyncio.gather(*futures))
+    
+    async def _flush_google_batches(self):
+        """google_batch_window초 동안 모인 텍스트를 언어 쌍별로 묶어 전송"""
+        pending: Dict[Tuple[str, str], List[Tuple[str, asyncio.Future]]] = {}
+        try:
+            await asyncio.sleep(self.google_batch_window)
+            
+            # 전송하는 동안 새로 쌓인 텍스트도 이어서 전송
+            while self._google_pending:
+                pending, self._google_pending = self._google_pending, {}
+                batches = []
+                for (source_lang, target_lang), items in pending.items():
+                    for batch in self._split_google_batches(items):
+                        batches.append(self._send_google_batch(batch, source_lang, target_lang))
+                await asyncio.gather(*batches)
+                pending = {}
+        
+        except asyncio.CancelledError:
+            self._fail_pending_google(pending, RuntimeError("Google translation batch was cancelled"))
+            raise
+        except Exception as e:
+            # 오류는 기다리는 쪽에 전달되므로 태스크 자체는 로그만 남기고 종료
+            self.logger.error(f"Google translation batch failed: {e}")
+            self._fail_pending_google(pending, e)
+    
+    def _fail_pending_google(self, pending: Dict[Tuple[str, str], List[Tuple[str, asyncio.Future]]],
+                             error: BaseException):
+        """전송 중이던 묶음과 대기 중인 텍스트의 future에 오류 전달 (기다리는 쪽이 멈추지 않도록)"""
+        leftovers = [*pending.values(), *self._google_pending.values()]
+        self._google_pending = {}
+        for items in leftovers:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(error)
+    
+    def _split_google_batches(self, items: List[Tuple[str, asyncio.Future]]) -> List[List[Tuple[str, asyncio.Future]]]:
+        """텍스트 수(google_batch_size)와 글자 수(google_batch_max_chars) 한도 안에서 묶음 나누기"""
+        batches = []
+        batch: List[Tuple[str, asyncio.Future]] = []
+        batch_chars = 0
+        for item in items:
+            text_chars = len(item[0])
+            if batch and (len(batch) >= self.google_batch_size
+                          or batch_chars + text_chars > self.google_batch_max_chars):
+                batches.append(batch)
+                batch = []
+                batch_chars = 0
+            # 한도보다 긴 텍스트 하나는 빈 묶음에 들어가 단독으로 전송됨
+            batch.append(item)
+            batch_chars += text_chars
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def _send_google_batch(self, items: List[Tuple[str, asyncio.Future]],
+                                 source_lang: str, target_lang: str):
+        """묶음 하나를 번역하고 요청 순서대로 결과 전달"""
+        texts = [text for text, _ in items]
+        translated_texts = await self.translate_many_with_google(texts, source_lang, target_lang)
+        if len(translated_texts) != len(texts):
+            self.logger.error(f"Google Translate returned {len(translated_texts)} translations for {len(texts)} texts")
+            translated_texts = [f"[Google Error] {text}" for text in texts]
+        
+        for (_, future), translated_text in zip(items, translated_texts):
+            # 기다리던 쪽이 취소된 경우 결과를 버림
+            if not future.done():
+                future.set_result(translated_text)
     
     async def translate_with_google(self, text: str, source_lang: str, target_lang: str) -> str:
         """Google Translate API 사용"""
+        translated_texts = await self.translate_many_with_google([text], source_lang, target_lang)
+        return translated_texts[0]
+    
+    async def translate_many_with_google(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """Google Translate API로 여러 텍스트를 한 번의 요청으로 번역 (q 파라미터 반복)"""
         if not self.google_api_key:
             self.logger.warning("Google Translate API key not configured")
-            return f"[Google] {text}"
+            return [f"[Google] {text}" for text in texts]
         
         try:
             url = f"https://translation.googleapis.com/language/translate/v2"
             
-            params = {
-                "key": self.google_api_key,
-                "q": text,
-                "source": source_lang,
-                "target": target_lang,
-                "format": "text"
-            }
+            params = [
+                ("key", self.google_api_key),
+                ("source", source_lang),
+                ("target", target_lang),
+                ("format", "text")
+            ]
+            params.extend(("q", text) for text in texts)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=params) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        translated_text = result["data"]["translations"][0]["translatedText"]
-                        return translated_text
-                    else:
-                        self.logger.error(f"Google Translate API error: {response.status}")
-                        return f"[Google Error] {text}"
-                        
+            session = await self._ensure_session()
+            async with session.post(url, data=params) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    # 번역 결과는 q 파라미터 순서대로 반환됨
+                    translations = result["data"]["translations"]
+                    return [translation["translatedText"] for translation in translations]
+                else:
+                    self.logger.error(f"Google Translate API error: {response.status}")
+                    return [f"[Google Error] {text}" for text in texts]
+                    
         except Exception as e:
             self.logger.error(f"Google Translate error: {e}")
-            return f"[Google Error] {text}"
+            return [f"[Google Error] {text}" for text in texts]
     
     async def translate_with_papago(self, text: str, source_lang: str, target_lang: str) -> str:
         """Papago 번역 API 사용"""
@@ -187,16 +377,16 @@ class TranslatorAgent(BaseAgent):
                 "text": text
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, data=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        translated_text = result["message"]["result"]["translatedText"]
-                        return translated_text
-                    else:
-                        self.logger.error(f"Papago API error: {response.status}")
-                        return f"[Papago Error] {text}"
-                        
+            session = await self._ensure_session()
+            async with session.post(url, headers=headers, data=data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    translated_text = result["message"]["result"]["translatedText"]
+                    return translated_text
+                else:
+                    self.logger.error(f"Papago API error: {response.status}")
+                    return f"[Papago Error] {text}"
+                    
         except Exception as e:
             self.logger.error(f"Papago Translate error: {e}")
             return f"[Papago Error] {text}"
@@ -231,7 +421,8 @@ class TranslatorAgent(BaseAgent):
             "supported_languages": self.supported_languages,
             "confidence_threshold": self.confidence_threshold,
             "google_configured": bool(self.google_api_key),
-            "papago_configured": bool(self.papago_client_id and self.papago_client_secret)
+            "papago_configured": bool(self.papago_client_id and self.papago_client_secret),
+            "cached_translations": len(self._translation_cache)
         }
         
         await self.send_message(requester, "translation_status", status)